@@ -3,10 +3,69 @@ Application configuration using Pydantic Settings.
 Loads environment variables for MongoDB connection, security, and app settings.
 """
 
-from typing import List
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+from urllib.parse import quote_plus
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+@lru_cache(maxsize=8)
+def _parse_api_keys(raw: str) -> FrozenSet[str]:
+    """Parse a comma-separated API key string into a set (memoized per raw value)."""
+    return frozenset(key.strip() for key in raw.split(",") if key.strip())
+
+
+@lru_cache(maxsize=16)
+def _parse_cors_list(raw: str) -> Tuple[str, ...]:
+    """Parse a comma-separated CORS setting into a tuple (memoized per raw value)."""
+    if raw == "*":
+        return ("*",)
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
+
+
+@lru_cache(maxsize=8)
+def _build_mongodb_uri(
+    uri: str,
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    db_name: str,
+    auth_source: str,
+) -> str:
+    """
+    Build MongoDB connection URI with authentication if credentials are provided.
+    
+    Memoized on its inputs so the branching and quoting run only once.
+    
+    Returns:
+        str: Complete MongoDB URI
+    """
+    # If uri is already a complete URI (starts with mongodb://), use it as-is
+    if uri.startswith(("mongodb://", "mongodb+srv://")):
+        # Check if it already contains credentials
+        if "@" in uri:
+            return uri
+        
+        # If username and password provided, inject them
+        if username and password:
+            # Insert credentials after mongodb://
+            protocol = "mongodb://"
+            if uri.startswith("mongodb+srv://"):
+                protocol = "mongodb+srv://"
+            
+            uri_without_protocol = uri[len(protocol):]
+            return f"{protocol}{quote_plus(username)}:{quote_plus(password)}@{uri_without_protocol}"
+        
+        return uri
+    
+    # Build URI from components
+    if username and password:
+        return f"mongodb://{quote_plus(username)}:{quote_plus(password)}@{host}:{port}/{db_name}?authSource={auth_source}"
+    else:
+        return f"mongodb://{host}:{port}"
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
@@ -27,6 +86,7 @@ class Settings(BaseSettings):
     MONGODB_MIN_POOL_SIZE: int = 10
     MONGODB_MAX_POOL_SIZE: int = 50
     MONGODB_AUTH_SOURCE: str = "admin"  # Authentication database
+    MONGODB_CREATE_INDEXES: bool = True  # Create the indexes queries rely on at startup
     
     # Security
     API_KEYS: str = ""  # Comma-separated list of API keys
@@ -44,6 +104,17 @@ class Settings(BaseSettings):
     
     # Rate Limiting (requests per hour)
     RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_REDIS_URL: str = ""  # Optional: share limits across workers (e.g. redis://localhost:6379/0)
+    RATE_LIMIT_REDIS_TIMEOUT: float = 0.05  # Seconds before falling back to the in-process limiter
+    RATE_LIMIT_REDIS_COOLDOWN: float = 5.0  # Seconds to skip Redis after a failed call
+    
+    # Health check database ping (seconds)
+    HEALTH_PING_TIMEOUT: float = 0.5  # Report unhealthy if MongoDB does not answer in time
+    HEALTH_PING_CACHE_TTL: float = 1.0  # Reuse the last ping result for this long
+    
+    # Aggregation result cache (seconds, 0 disables)
+    AGGREGATION_CACHE_TTL: int = 60
+    AGGREGATION_CACHE_CLOSED_RANGE_TTL: int = 3600  # Ranges that ended over a day ago
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -51,17 +122,61 @@ class Settings(BaseSettings):
         case_sensitive=True
     )
     
+    @property
+    def api_keys_set(self) -> FrozenSet[str]:
+        """
+        Valid API keys as a frozenset for O(1) membership checks.
+        
+        Parsing is memoized on the raw API_KEYS string, so the split/strip
+        only runs again if API_KEYS is reassigned.
+        """
+        return _parse_api_keys(self.API_KEYS)
+    
+    @property
+    def auth_disabled(self) -> bool:
+        """Whether API key authentication is off (no API_KEYS configured)."""
+        return not self.api_keys_set
+    
     def get_api_keys(self) -> List[str]:
         """Parse API keys from comma-separated string."""
-        if not self.API_KEYS:
-            return []
-        return [key.strip() for key in self.API_KEYS.split(",") if key.strip()]
+        return list(self.api_keys_set)
+    
+    @property
+    def cors_origins_tuple(self) -> Tuple[str, ...]:
+        """Allowed CORS origins as an immutable tuple (memoized on CORS_ORIGINS)."""
+        return _parse_cors_list(self.CORS_ORIGINS)
+    
+    @property
+    def cors_methods(self) -> Tuple[str, ...]:
+        """Allowed CORS methods as an immutable tuple (memoized on CORS_ALLOW_METHODS)."""
+        return _parse_cors_list(self.CORS_ALLOW_METHODS)
+    
+    @property
+    def cors_headers(self) -> Tuple[str, ...]:
+        """Allowed CORS headers as an immutable tuple (memoized on CORS_ALLOW_HEADERS)."""
+        return _parse_cors_list(self.CORS_ALLOW_HEADERS)
     
     def get_cors_origins(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
-        if self.CORS_ORIGINS == "*":
-            return ["*"]
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
+        return list(self.cors_origins_tuple)
+    
+    @property
+    def mongodb_uri(self) -> str:
+        """
+        MongoDB connection URI, built once per distinct set of connection settings.
+        
+        Returns:
+            str: Complete MongoDB URI
+        """
+        return _build_mongodb_uri(
+            self.MONGODB_URI,
+            self.MONGODB_HOST,
+            self.MONGODB_PORT,
+            self.MONGODB_USERNAME,
+            self.MONGODB_PASSWORD,
+            self.MONGODB_DB_NAME,
+            self.MONGODB_AUTH_SOURCE,
+        )
     
     def get_mongodb_uri(self) -> str:
         """
@@ -70,37 +185,19 @@ class Settings(BaseSettings):
         Returns:
             str: Complete MongoDB URI
         """
-        # If MONGODB_URI is already a complete URI (starts with mongodb://), use it as-is
-        if self.MONGODB_URI.startswith("mongodb://") or self.MONGODB_URI.startswith("mongodb+srv://"):
-            # Check if it already contains credentials
-            if "@" in self.MONGODB_URI:
-                return self.MONGODB_URI
-            
-            # If username and password provided, inject them
-            if self.MONGODB_USERNAME and self.MONGODB_PASSWORD:
-                from urllib.parse import quote_plus
-                username = quote_plus(self.MONGODB_USERNAME)
-                password = quote_plus(self.MONGODB_PASSWORD)
-                
-                # Insert credentials after mongodb://
-                protocol = "mongodb://"
-                if self.MONGODB_URI.startswith("mongodb+srv://"):
-                    protocol = "mongodb+srv://"
-                
-                uri_without_protocol = self.MONGODB_URI.replace(protocol, "")
-                return f"{protocol}{username}:{password}@{uri_without_protocol}"
-            
-            return self.MONGODB_URI
-        
-        # Build URI from components
-        if self.MONGODB_USERNAME and self.MONGODB_PASSWORD:
-            from urllib.parse import quote_plus
-            username = quote_plus(self.MONGODB_USERNAME)
-            password = quote_plus(self.MONGODB_PASSWORD)
-            return f"mongodb://{username}:{password}@{self.MONGODB_HOST}:{self.MONGODB_PORT}/{self.MONGODB_DB_NAME}?authSource={self.MONGODB_AUTH_SOURCE}"
-        else:
-            return f"mongodb://{self.MONGODB_HOST}:{self.MONGODB_PORT}"
+        return self.mongodb_uri
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings singleton.
+    
+    Returns:
+        Settings: Memoized settings instance
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -3,10 +3,34 @@ MongoDB database connection and client management.
 Handles connection pooling and provides access to database collections.
 """
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+import time
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, TEXT
+from typing import List, Optional
 
 from app.config import settings
+from app.utils.logger import log_info, log_error, log_warning
+
+
+# Indexes the news queries rely on, created at startup when enabled
+NEWS_INDEXES: List[IndexModel] = [
+    # News list: equality filter first, then the (releasedAt, _id) sort,
+    # which also serves releasedAt ranges; each serves both sort orders
+    IndexModel([("releasedAt", DESCENDING), ("_id", DESCENDING)], name="news_released"),
+    IndexModel(
+        [("source", ASCENDING), ("releasedAt", DESCENDING), ("_id", DESCENDING)],
+        name="news_source_released"
+    ),
+    IndexModel(
+        [("assets.slug", ASCENDING), ("releasedAt", DESCENDING), ("_id", DESCENDING)],
+        name="news_asset_released"
+    ),
+    # Keyword search ($text)
+    IndexModel(
+        [("title", TEXT), ("subtitle", TEXT), ("content", TEXT)],
+        name="news_text"
+    ),
+]
 
 
 class DatabaseManager:
@@ -15,6 +39,12 @@ class DatabaseManager:
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
         self.db: Optional[AsyncIOMotorDatabase] = None
+        # Handle for the default news collection, cached on connect()
+        self._default_collection: Optional[AsyncIOMotorCollection] = None
+        self._default_collection_name: Optional[str] = None
+        # Last ping result and when it was taken (time.monotonic())
+        self._ping_ok: bool = False
+        self._ping_checked_at: Optional[float] = None
     
     async def connect(self):
         """
@@ -22,7 +52,7 @@ class DatabaseManager:
         Creates connection pool with configured min/max pool size.
         """
         try:
-            mongodb_uri = settings.get_mongodb_uri()
+            mongodb_uri = settings.mongodb_uri
             
             self.client = AsyncIOMotorClient(
                 mongodb_uri,
@@ -30,20 +60,38 @@ class DatabaseManager:
                 maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
             )
             self.db = self.client[settings.MONGODB_DB_NAME]
+            self._default_collection_name = settings.MONGODB_COLLECTION_NAME
+            self._default_collection = self.db[self._default_collection_name]
             
             # Test connection
             await self.client.admin.command('ping')
-            print(f"✅ Connected to MongoDB: {settings.MONGODB_DB_NAME}")
+            self._ping_checked_at = None
+            log_info("Connected to MongoDB", database=settings.MONGODB_DB_NAME)
             
         except Exception as e:
-            print(f"❌ Failed to connect to MongoDB: {e}")
+            log_error("Failed to connect to MongoDB", error=str(e))
             raise
     
+    async def ensure_indexes(self):
+        """
+        Create NEWS_INDEXES on the news collection.
+        
+        createIndexes is a no-op for indexes that already exist. Failures
+        (e.g. a read-only user, or an existing index with other options)
+        are logged and do not stop startup.
+        """
+        try:
+            names = await self.get_collection().create_indexes(NEWS_INDEXES)
+            log_info("MongoDB indexes ensured", indexes=",".join(names))
+        except Exception as e:
+            log_warning("Failed to create MongoDB indexes", error=str(e))
+    
     async def disconnect(self):
         """Close MongoDB connection."""
         if self.client:
             self.client.close()
-            print("✅ Disconnected from MongoDB")
+            self._ping_checked_at = None
+            log_info("Disconnected from MongoDB")
     
     async def ping(self) -> bool:
         """
@@ -56,7 +104,27 @@ class DatabaseManager:
         except Exception:
             return False
     
-    def get_collection(self, collection_name: str = None):
+    async def ping_cached(self, ttl: float = 1.0) -> bool:
+        """
+        Ping the database, reusing the last result for ttl seconds.
+        
+        Health probes arrive from several sources every few seconds; this
+        keeps them from turning into a steady stream of pings.
+        
+        Args:
+            ttl: Seconds a ping result stays valid
+        
+        Returns:
+            bool: Result of the most recent ping
+        """
+        now = time.monotonic()
+        if self._ping_checked_at is not None and now - self._ping_checked_at < ttl:
+            return self._ping_ok
+        self._ping_ok = await self.ping()
+        self._ping_checked_at = time.monotonic()
+        return self._ping_ok
+    
+    def get_collection(self, collection_name: str = None) -> AsyncIOMotorCollection:
         """
         Get a collection from the database.
         
@@ -68,6 +136,11 @@ class DatabaseManager:
         """
         if collection_name is None:
             collection_name = settings.MONGODB_COLLECTION_NAME
+        if (
+            self._default_collection is not None
+            and collection_name == self._default_collection_name
+        ):
+            return self._default_collection
         return self.db[collection_name]
 
 
@@ -75,9 +148,9 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 
-async def get_database() -> AsyncIOMotorDatabase:
+def get_database() -> AsyncIOMotorDatabase:
     """
-    Dependency for getting database instance.
-    Used in FastAPI dependency injection.
+    Get the database instance.
+    Plain accessor - nothing is awaited.
     """
     return db_manager.db
@@ -4,13 +4,34 @@ Handles encoding/decoding of cursors and building MongoDB queries for pagination
 """
 
 import base64
-import json
+import struct
+import sys
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from bson import ObjectId
+from bson.errors import InvalidId
 
 from app.utils.exceptions import InvalidCursorException
 
 
+# Compact binary cursor layout: tag byte, 12-byte ObjectId, int64 microseconds since epoch.
+# The tag has its high bit set (so it can never be the "{" that starts a JSON cursor)
+# and its low bits index the sort field in _BINARY_CURSOR_FIELDS.
+_BINARY_CURSOR = struct.Struct("<B12sq")
+_BINARY_CURSOR_TAG = 0x80
+_BINARY_CURSOR_FIELDS = ("releasedAt", "createdAt", "updatedAt")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Sort fields whose cursor values are datetimes
+_DATETIME_FIELDS = frozenset({"releasedAt", "createdAt", "updatedAt"})
+
+# datetime.fromisoformat() accepts a trailing "Z" natively from Python 3.11
+_ISO_Z_OK = sys.version_info >= (3, 11)
+
+
 class PaginationCursor:
     """Handles cursor encoding and decoding for pagination."""
     
@@ -19,12 +40,23 @@ class PaginationCursor:
         """
         Encode cursor data to base64 string.
         
+        The common ``{_id: ObjectId, <date field>: datetime}`` shape is packed
+        into a fixed-width 21-byte binary payload (28 URL-safe characters).
+        Any other shape falls back to unpadded URL-safe base64 of JSON.
+        
         Args:
             cursor_data: Dictionary containing cursor information (e.g., _id, releasedAt)
         
         Returns:
             str: Base64 encoded cursor string
         """
+        if len(cursor_data) == 2 and "_id" in cursor_data:
+            for key, value in cursor_data.items():
+                if key != "_id":
+                    packed = PaginationCursor._encode_binary(cursor_data["_id"], value, key)
+                    if packed is not None:
+                        return packed
+        
         try:
             # Convert datetime to ISO format string for JSON serialization
             serializable_data = {}
@@ -34,24 +66,77 @@ class PaginationCursor:
                     iso_string = value.isoformat()
                     # Ensure consistent format by replacing +00:00 with Z
                     if iso_string.endswith('+00:00'):
-                        iso_string = iso_string.replace('+00:00', 'Z')
+                        iso_string = iso_string[:-6] + 'Z'
                     serializable_data[key] = iso_string
                 else:
                     serializable_data[key] = str(value)
             
-            json_str = json.dumps(serializable_data, sort_keys=True)
-            encoded = base64.b64encode(json_str.encode()).decode()
-            return encoded
+            json_bytes = orjson.dumps(serializable_data, option=orjson.OPT_SORT_KEYS)
+            return base64.urlsafe_b64encode(json_bytes).rstrip(b"=").decode("ascii")
         except Exception as e:
             raise InvalidCursorException(f"Failed to encode cursor: {str(e)}")
     
+    @staticmethod
+    def encode_id_time(doc_id: Any, value: Any, sort_field: str) -> str:
+        """
+        Encode a cursor for a single document position.
+        
+        Specialized path for the ``_id`` + sort value pair produced by every
+        paginated response: skips building a dict and the generic per-key loop.
+        
+        Args:
+            doc_id: Document _id
+            value: Sort field value of the document
+            sort_field: Field used for sorting
+        
+        Returns:
+            str: Encoded cursor string
+        """
+        packed = PaginationCursor._encode_binary(doc_id, value, sort_field)
+        if packed is not None:
+            return packed
+        return PaginationCursor.encode({"_id": doc_id, sort_field: value})
+    
+    @staticmethod
+    def _encode_binary(doc_id: Any, value: Any, sort_field: str) -> Optional[str]:
+        """
+        Pack an (ObjectId, datetime) cursor into the compact binary format.
+        
+        Args:
+            doc_id: Document _id (ObjectId or its 24-char hex string)
+            value: Sort field value
+            sort_field: Name of the sort field
+        
+        Returns:
+            str: URL-safe base64 cursor, or None if the values don't fit the binary layout
+        """
+        if not isinstance(value, datetime) or sort_field not in _BINARY_CURSOR_FIELDS:
+            return None
+        
+        if not isinstance(doc_id, ObjectId):
+            try:
+                doc_id = ObjectId(doc_id)
+            except (InvalidId, TypeError):
+                return None
+        
+        # MongoDB returns naive datetimes in UTC
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        
+        payload = _BINARY_CURSOR.pack(
+            _BINARY_CURSOR_TAG | _BINARY_CURSOR_FIELDS.index(sort_field),
+            doc_id.binary,
+            (value - _EPOCH) // _ONE_MICROSECOND,
+        )
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+    
     @staticmethod
     def decode(cursor: str) -> Dict[str, Any]:
         """
         Decode base64 cursor string to dictionary.
         
         Args:
-            cursor: Base64 encoded cursor string
+            cursor: Base64 encoded cursor string (binary or JSON payload)
         
         Returns:
             dict: Decoded cursor data
@@ -60,8 +145,20 @@ class PaginationCursor:
             InvalidCursorException: If cursor format is invalid
         """
         try:
-            decoded = base64.b64decode(cursor.encode()).decode()
-            cursor_data = json.loads(decoded)
+            # Restores stripped padding; the standard alphabet of older JSON
+            # cursors is accepted too
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            
+            if len(raw) == _BINARY_CURSOR.size and raw[0] & _BINARY_CURSOR_TAG:
+                tag, oid_bytes, micros = _BINARY_CURSOR.unpack(raw)
+                return {
+                    "_id": ObjectId(oid_bytes),
+                    _BINARY_CURSOR_FIELDS[tag & ~_BINARY_CURSOR_TAG]: _EPOCH + timedelta(microseconds=micros),
+                }
+            
+            cursor_data = orjson.loads(raw)
+            if not isinstance(cursor_data, dict):
+                raise InvalidCursorException("Cursor payload is not an object")
             return cursor_data
         except Exception as e:
             raise InvalidCursorException(f"Invalid cursor format: {str(e)}")
@@ -93,43 +190,25 @@ class PaginationCursor:
             return {}
         
         # Convert ISO string back to datetime if needed
-        if sort_field in ["releasedAt", "createdAt", "updatedAt"]:
+        if sort_field in _DATETIME_FIELDS:
             try:
                 # Handle both Z and +00:00 formats
                 if isinstance(cursor_value, str):
-                    if cursor_value.endswith('Z'):
-                        cursor_value = datetime.fromisoformat(cursor_value.replace('Z', '+00:00'))
-                    else:
-                        cursor_value = datetime.fromisoformat(cursor_value)
+                    if not _ISO_Z_OK and cursor_value.endswith('Z'):
+                        cursor_value = cursor_value[:-1] + '+00:00'
+                    cursor_value = datetime.fromisoformat(cursor_value)
             except ValueError:
                 # If parsing fails, keep as string
                 pass
         
-        # Build query based on sort order
-        if sort_order == "desc":
-            # For descending order: find documents with value less than cursor
-            query = {
-                "$or": [
-                    {sort_field: {"$lt": cursor_value}},
-                    {
-                        sort_field: cursor_value,
-                        "_id": {"$lt": cursor_id}
-                    }
-                ]
-            }
-        else:
-            # For ascending order: find documents with value greater than cursor
-            query = {
-                "$or": [
-                    {sort_field: {"$gt": cursor_value}},
-                    {
-                        sort_field: cursor_value,
-                        "_id": {"$gt": cursor_id}
-                    }
-                ]
-            }
-        
-        return query
+        # Descending pages continue below the cursor, ascending pages above it
+        op = "$lt" if sort_order == "desc" else "$gt"
+        return {
+            "$or": [
+                {sort_field: {op: cursor_value}},
+                {sort_field: cursor_value, "_id": {op: cursor_id}},
+            ]
+        }
 
 
 def create_pagination_response(
@@ -162,17 +241,15 @@ def create_pagination_response(
     
     if has_next and items:
         last_item = items[-1]
-        next_cursor = PaginationCursor.encode({
-            "_id": str(last_item["_id"]),
-            sort_field: last_item.get(sort_field)
-        })
+        next_cursor = PaginationCursor.encode_id_time(
+            last_item["_id"], last_item.get(sort_field), sort_field
+        )
     
     if has_prev and items:
         first_item = items[0]
-        prev_cursor = PaginationCursor.encode({
-            "_id": str(first_item["_id"]),
-            sort_field: first_item.get(sort_field)
-        })
+        prev_cursor = PaginationCursor.encode_id_time(
+            first_item["_id"], first_item.get(sort_field), sort_field
+        )
     
     return {
         "next_cursor": next_cursor,
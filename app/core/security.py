@@ -5,7 +5,9 @@ Validates API keys from Authorization header or query parameters.
 
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader, APIKeyQuery
+from starlette.types import Scope
 from typing import Optional
+from urllib.parse import unquote_to_bytes
 
 from app.config import settings
 
@@ -14,6 +16,14 @@ from app.config import settings
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 api_key_query = APIKeyQuery(name="api_key", auto_error=False)
 
+# Accepted Authorization header prefixes (both are 7 characters long)
+_BEARER_PREFIXES = ("Bearer ", "bearer ")
+_BEARER_PREFIXES_BYTES = (b"Bearer ", b"bearer ")
+_API_KEY_PARAM = b"api_key="
+
+# Key reported when authentication is disabled
+DEVELOPMENT_MODE_KEY = "development-mode"
+
 
 async def verify_api_key(
     api_key_header: Optional[str] = Security(api_key_header),
@@ -36,17 +46,20 @@ async def verify_api_key(
     Raises:
         HTTPException: If API key is missing or invalid
     """
-    valid_api_keys = settings.get_api_keys()
-    
     # If no API keys configured, allow all requests (development mode)
-    if not valid_api_keys:
-        return "development-mode"
+    if settings.auth_disabled:
+        return DEVELOPMENT_MODE_KEY
+    
+    valid_api_keys = settings.api_keys_set
     
     # Try to get API key from header first
     api_key = None
     if api_key_header:
-        # Remove "Bearer " prefix if present
-        api_key = api_key_header.replace("Bearer ", "").replace("bearer ", "")
+        # Strip a leading "Bearer " prefix only (never mid-string)
+        if api_key_header.startswith(_BEARER_PREFIXES):
+            api_key = api_key_header[7:]
+        else:
+            api_key = api_key_header
     elif api_key_query:
         api_key = api_key_query
     
@@ -69,6 +82,64 @@ async def verify_api_key(
     return api_key
 
 
+def extract_api_key(scope: Scope) -> Optional[bytes]:
+    """
+    Extract the raw API key from an ASGI scope without parsing the request.
+    
+    Looks for a "Bearer" Authorization header first, then scans the raw
+    query string for an ``api_key`` parameter. Used by middleware that only
+    needs the key as an identifier; it is not validated.
+    
+    Args:
+        scope: ASGI HTTP scope
+    
+    Returns:
+        bytes: Raw API key, or None if not present
+    """
+    authorization = None
+    # ASGI header names are already lowercased
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            authorization = value
+            break
+    
+    return parse_api_key(authorization, scope.get("query_string", b""))
+
+
+def parse_api_key(authorization: Optional[bytes], query_string: bytes) -> Optional[bytes]:
+    """
+    Get the raw API key from an Authorization header value and query string.
+    
+    For middleware that already walks ``scope["headers"]`` itself and has
+    the Authorization value at hand. A query string key is URL-decoded and
+    the last ``api_key`` parameter wins, as in verify_api_key, so every
+    spelling of one key maps to the same identifier.
+    
+    Args:
+        authorization: Raw Authorization header value, or None
+        query_string: Raw ASGI query string
+    
+    Returns:
+        bytes: Raw API key, or None if not present
+    """
+    if authorization is not None and authorization.startswith(_BEARER_PREFIXES_BYTES):
+        return authorization[7:]
+    
+    index = query_string.rfind(_API_KEY_PARAM)
+    while index != -1:
+        # Only match at a parameter boundary (not e.g. "x_api_key=")
+        if index == 0 or query_string[index - 1] == 0x26:  # b"&"
+            start = index + len(_API_KEY_PARAM)
+            end = query_string.find(b"&", start)
+            value = query_string[start:] if end == -1 else query_string[start:end]
+            if b"%" in value or b"+" in value:
+                value = unquote_to_bytes(value.replace(b"+", b" "))
+            return value
+        index = query_string.rfind(_API_KEY_PARAM, 0, index)
+    
+    return None
+
+
 def get_api_key_info(api_key: str) -> dict:
     """
     Get information about an API key.
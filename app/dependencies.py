@@ -3,19 +3,62 @@ Dependency injection utilities.
 Provides reusable dependencies for FastAPI endpoints.
 """
 
+from typing import Any, Dict, Tuple, Type, TypeVar
+
 from fastapi import Depends
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.core.database import get_database
+from app.config import settings
+from app.core.database import db_manager
 from app.core.security import verify_api_key
+from app.services.aggregation_service import AggregationService
+from app.services.news_service import NewsService
+
+
+ServiceT = TypeVar("ServiceT")
+
+# Shared service instances: class -> (database, collection name, instance)
+_shared_services: Dict[type, Tuple[Any, str, Any]] = {}
+
+
+def _shared_service(service_class: Type[ServiceT], db: AsyncIOMotorDatabase) -> ServiceT:
+    """
+    Get the process-wide instance of a database-backed service.
+    
+    One instance is reused across requests instead of being built per call;
+    it is rebuilt only if the database or collection changes (reconnects,
+    tests swapping the database).
+    """
+    collection_name = settings.MONGODB_COLLECTION_NAME
+    entry = _shared_services.get(service_class)
+    if entry is None or entry[0] is not db or entry[1] != collection_name:
+        entry = _shared_services[service_class] = (db, collection_name, service_class(db))
+    return entry[2]
 
 
 async def get_db() -> AsyncIOMotorDatabase:
     """
     Get database dependency.
     Used in endpoint dependency injection.
+    
+    Kept as ``async def`` on purpose: FastAPI runs plain ``def`` dependencies
+    in the threadpool, which costs more than awaiting a trivial coroutine.
     """
-    return await get_database()
+    return db_manager.db
+
+
+async def get_agg_service(
+    db: AsyncIOMotorDatabase = Depends(get_db)
+) -> AggregationService:
+    """Get the shared aggregation service."""
+    return _shared_service(AggregationService, db)
+
+
+async def get_shared_news_service(
+    db: AsyncIOMotorDatabase = Depends(get_db)
+) -> NewsService:
+    """Get the shared news service."""
+    return _shared_service(NewsService, db)
 
 
 async def get_current_api_key(
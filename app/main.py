@@ -4,17 +4,18 @@ Initializes the API, configures middleware, and includes routers.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-from datetime import datetime
 
 from app.config import settings
 from app.core.database import db_manager
 from app.routers import news, health, aggregations
 from app.middleware.logging import RequestLoggingMiddleware
-from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, close_redis_limiters
 from app.middleware.error_handler import ErrorHandlerMiddleware
 from app.middleware.cors import configure_cors
-from app.utils.logger import logger, log_info, log_error
+from app.utils.logger import log_info, log_error
+from app.utils.timestamps import utc_now_iso
 
 
 @asynccontextmanager
@@ -28,6 +29,8 @@ async def lifespan(app: FastAPI):
     try:
         # Connect to MongoDB
         await db_manager.connect()
+        if settings.MONGODB_CREATE_INDEXES:
+            await db_manager.ensure_indexes()
         log_info("Application started successfully")
     except Exception as e:
         log_error("Failed to start application", error=str(e))
@@ -38,6 +41,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     log_info("Shutting down application")
     await db_manager.disconnect()
+    await close_redis_limiters()
     log_info("Application shut down successfully")
 
 
@@ -70,6 +74,7 @@ app = FastAPI(
     openapi_url="/openapi.json",
     lifespan=lifespan,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS (must be first)
@@ -105,7 +110,7 @@ async def root():
             "aggregations": True
         },
         "Git":"https://github.com/Farhad-Valipour/ClickHouseAPI",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_now_iso()
     }
 
 
@@ -116,6 +121,8 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower()
     )
@@ -17,25 +17,13 @@ def configure_cors(app: FastAPI) -> None:
     Args:
         app: FastAPI application instance
     """
-    # Get allowed origins
-    origins = settings.get_cors_origins()
-    
-    # Parse allowed methods
-    methods = [m.strip() for m in settings.CORS_ALLOW_METHODS.split(",")]
-    
-    # Parse allowed headers (if not wildcard)
-    if settings.CORS_ALLOW_HEADERS == "*":
-        headers = ["*"]
-    else:
-        headers = [h.strip() for h in settings.CORS_ALLOW_HEADERS.split(",")]
-    
-    # Add CORS middleware
+    # Add CORS middleware (origins/methods/headers are parsed once on Settings)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=origins,
+        allow_origins=settings.cors_origins_tuple,
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
-        allow_methods=methods,
-        allow_headers=headers,
+        allow_methods=settings.cors_methods,
+        allow_headers=settings.cors_headers,
         expose_headers=[
             "X-Process-Time",
             "X-RateLimit-Limit",
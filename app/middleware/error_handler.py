@@ -3,95 +3,99 @@ Global error handler middleware.
 Catches all unhandled exceptions and returns consistent error responses.
 """
 
-import traceback
-import uuid
-from typing import Callable
-from datetime import datetime
-from fastapi import Request, Response, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from os import urandom
+from typing import Optional, Tuple
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import ValidationError
 
 from app.utils.logger import log_error
+from app.utils.timestamps import utc_now_iso
 from app.utils.exceptions import (
     NewsNotFoundException,
     InvalidCursorException,
+    InvalidDateException,
     RateLimitExceededException,
 )
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+# Expected exception types -> (HTTP status, application error code).
+# Resolved by walking the exception's MRO, so subclasses map like their base.
+# Expected errors are never logged with a traceback; only unexpected ones are.
+_ERROR_DISPATCH = {
+    NewsNotFoundException: (status.HTTP_404_NOT_FOUND, "NEWS_NOT_FOUND"),
+    InvalidCursorException: (status.HTTP_400_BAD_REQUEST, "INVALID_CURSOR"),
+    InvalidDateException: (status.HTTP_400_BAD_REQUEST, "INVALID_DATE_FORMAT"),
+    RateLimitExceededException: (status.HTTP_429_TOO_MANY_REQUESTS, "RATE_LIMIT_EXCEEDED"),
+    ValueError: (status.HTTP_400_BAD_REQUEST, "INVALID_VALUE"),
+}
+
+
+class ErrorHandlerMiddleware:
     """
     Middleware for handling all application errors.
     Provides consistent error response format.
+    
+    Implemented as a plain ASGI middleware: the success path only adds a
+    try/except around the downstream app, and a Response is built only
+    when an error has to be reported.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and handle any errors.
         
         Args:
-            request: Incoming request
-            call_next: Next middleware/handler
-        
-        Returns:
-            Response: HTTP response or error response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Generate unique request ID for tracking
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Generate unique request ID for tracking (exposed as request.state.request_id)
+        request_id = _new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        
+        response_started = False
+        
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
         
         try:
-            response = await call_next(request)
-            return response
-        
-        except NewsNotFoundException as e:
-            # 404 Not Found
-            return self._create_error_response(
-                status_code=status.HTTP_404_NOT_FOUND,
-                error_code="NEWS_NOT_FOUND",
-                message=str(e),
-                request_id=request_id
-            )
-        
-        except InvalidCursorException as e:
-            # 400 Bad Request - Invalid Cursor
-            return self._create_error_response(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                error_code="INVALID_CURSOR",
-                message=str(e),
-                request_id=request_id
-            )
-        
-        except RateLimitExceededException as e:
-            # 429 Too Many Requests
-            return self._create_error_response(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                error_code="RATE_LIMIT_EXCEEDED",
-                message=str(e),
-                request_id=request_id
-            )
-        
-        except ValidationError as e:
-            # 422 Validation Error (Pydantic)
-            return self._create_validation_error_response(e, request_id)
-        
-        except ValueError as e:
-            # 400 Bad Request - Invalid Value
-            return self._create_error_response(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                error_code="INVALID_VALUE",
-                message=str(e),
-                request_id=request_id
-            )
+            await self.app(scope, receive, send_tracking_start)
         
         except Exception as e:
-            # 500 Internal Server Error - Unexpected
-            return self._handle_unexpected_error(e, request, request_id)
+            # Too late to replace the response once headers have gone out
+            if response_started:
+                raise
+            
+            if isinstance(e, ValidationError):
+                # 422 Validation Error (Pydantic)
+                response = self._create_validation_error_response(e, request_id)
+            else:
+                mapped = _lookup_error(e)
+                if mapped is not None:
+                    status_code, error_code = mapped
+                    response = self._create_error_response(
+                        status_code=status_code,
+                        error_code=error_code,
+                        message=str(e),
+                        request_id=request_id
+                    )
+                else:
+                    # 500 Internal Server Error - Unexpected
+                    response = self._handle_unexpected_error(e, scope, request_id)
+            
+            await response(scope, receive, send)
     
     def _create_error_response(
         self,
@@ -100,7 +104,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         message: str,
         request_id: str,
         details: dict = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Create standardized error response.
         
@@ -112,14 +116,14 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             details: Additional error details
         
         Returns:
-            JSONResponse: Error response
+            ORJSONResponse: Error response
         """
         error_data = {
             "error": {
                 "code": error_code,
                 "message": message,
                 "status": status_code,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": utc_now_iso(),
                 "request_id": request_id
             }
         }
@@ -127,7 +131,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         if details:
             error_data["error"]["details"] = details
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status_code,
             content=error_data
         )
@@ -136,7 +140,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         self,
         error: ValidationError,
         request_id: str
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Create response for Pydantic validation errors.
         
@@ -145,7 +149,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
             request_id: Unique request identifier
         
         Returns:
-            JSONResponse: Validation error response
+            ORJSONResponse: Validation error response
         """
         # Extract validation errors
         details = []
@@ -168,32 +172,35 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
     def _handle_unexpected_error(
         self,
         error: Exception,
-        request: Request,
+        scope: Scope,
         request_id: str
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Handle unexpected errors (500 Internal Server Error).
         
         Args:
             error: The exception that occurred
-            request: The request that caused the error
+            scope: ASGI scope of the request that caused the error
             request_id: Unique request identifier
         
         Returns:
-            JSONResponse: Internal server error response
+            ORJSONResponse: Internal server error response
         """
-        # Log full error with traceback
-        error_trace = traceback.format_exc()
+        # Log full error with traceback (formatted by the log handler)
         log_error(
             "Unexpected error occurred",
+            exc_info=error,
             error=str(error),
             error_type=type(error).__name__,
-            path=request.url.path,
-            method=request.method,
-            request_id=request_id,
-            traceback=error_trace
+            path=scope["path"],
+            method=scope["method"],
+            request_id=request_id
         )
         
+        # The log record holds its own reference to the traceback, so the
+        # exception can let go of its frames without waiting for the GC
+        error.__traceback__ = None
+        
         # Return generic error (don't expose internal details)
         return self._create_error_response(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -206,6 +213,41 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         )
 
 
+def _new_request_id() -> str:
+    """
+    Generate a random request ID in the familiar 8-4-4-4-12 hex layout.
+    
+    Formats 16 random bytes directly; the UUID version/variant bits are
+    not needed for a tracking ID.
+    
+    Returns:
+        str: Request ID
+    """
+    b = urandom(16)
+    return f"{b[:4].hex()}-{b[4:6].hex()}-{b[6:8].hex()}-{b[8:10].hex()}-{b[10:].hex()}"
+
+
+def _lookup_error(error: Exception) -> Optional[Tuple[int, str]]:
+    """
+    Find the (status, error code) mapping for an expected exception.
+    
+    Args:
+        error: Raised exception
+    
+    Returns:
+        tuple: (status_code, error_code), or None for unexpected errors
+    """
+    # Fast path: exact type match (the common case)
+    mapped = _ERROR_DISPATCH.get(type(error))
+    if mapped is not None:
+        return mapped
+    for cls in type(error).__mro__[1:]:
+        mapped = _ERROR_DISPATCH.get(cls)
+        if mapped is not None:
+            return mapped
+    return None
+
+
 def format_error_response(
     status_code: int,
     error_code: str,
@@ -229,7 +271,7 @@ def format_error_response(
             "code": error_code,
             "message": message,
             "status": status_code,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": utc_now_iso()
         }
     }
     
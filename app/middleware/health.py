@@ -0,0 +1,23 @@
+"""
+Health check paths.
+Shared by the middleware that skips work for health probes.
+"""
+
+
+# Exact paths of the health endpoints (see app.routers.health)
+HEALTH_PATHS = frozenset({
+    "/api/v1/health",
+    "/api/v1/health/ready",
+    "/api/v1/health/live",
+})
+
+
+def is_health_path(path: str) -> bool:
+    """
+    Check whether a request path is one of the health endpoints.
+    
+    Liveness/readiness probes arrive every few seconds and need no access
+    logging or rate limiting. Only the registered paths match, so unknown
+    paths such as ``/api/v1/healthz`` still go through the full stack.
+    """
+    return path in HEALTH_PATHS
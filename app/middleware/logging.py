@@ -3,89 +3,78 @@ Request/Response logging middleware.
 Logs all incoming requests and outgoing responses with detailed information.
 """
 
+import logging
 import time
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.utils.logger import log_info, log_error
+from app.core.security import parse_api_key
+from app.middleware.health import is_health_path
+from app.utils.logger import logger, log_info, log_error
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Middleware for logging all requests and responses.
     Captures method, path, query params, status code, and response time.
+    
+    Implemented as a plain ASGI middleware: request details are read straight
+    from the scope, and X-Process-Time is added to the response start message
+    instead of going through a Response object.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and log details.
         
         Args:
-            request: Incoming request
-            call_next: Next middleware/handler
-        
-        Returns:
-            Response: HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        # Health probes are not logged
+        if scope["type"] != "http" or is_health_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        
         # Start timer
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Extract request details
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params)
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
-        # Extract API key (if present) - truncate for security
-        api_key = None
-        auth_header = request.headers.get("authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            api_key = auth_header.replace("Bearer ", "")
-            api_key = api_key[:8] + "..." if len(api_key) > 8 else api_key
-        elif "api_key" in query_params:
-            api_key = query_params["api_key"]
-            api_key = api_key[:8] + "..." if len(api_key) > 8 else api_key
-        
-        # Log incoming request
-        log_info(
-            f"Incoming request: {method} {path}",
-            client_ip=client_ip,
-            query_params=str(query_params) if query_params else None,
-            api_key=api_key,
-            user_agent=user_agent[:50] if user_agent else None  # Truncate UA
-        )
+        # Access logs are skipped entirely (header scan included) when INFO is filtered out
+        log_requests = logger.isEnabledFor(logging.INFO)
+        if log_requests:
+            self._log_incoming(scope, method, path, client_ip)
+        
+        status_code = None
+        response_time_ms = None
+        
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code, response_time_ms
+            if message["type"] == "http.response.start":
+                # Time to first byte of the response
+                response_time_ms = round((time.perf_counter_ns() - start_ns) / 1e6, 2)
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-process-time", b"%.2f" % response_time_ms),
+                ]
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate response time
-            process_time = time.time() - start_time
-            response_time_ms = round(process_time * 1000, 2)
-            
-            # Log response
-            log_info(
-                f"Response: {method} {path} → {response.status_code}",
-                status_code=response.status_code,
-                response_time_ms=response_time_ms,
-                client_ip=client_ip
-            )
-            
-            # Add custom header with response time
-            response.headers["X-Process-Time"] = str(response_time_ms)
-            
-            return response
+            await self.app(scope, receive, send_with_process_time)
         
         except Exception as e:
             # Calculate response time even for errors
-            process_time = time.time() - start_time
-            response_time_ms = round(process_time * 1000, 2)
+            response_time_ms = round((time.perf_counter_ns() - start_ns) / 1e6, 2)
             
             # Log error
             log_error(
@@ -97,3 +86,54 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             
             # Re-raise exception to be handled by error handler
             raise
+        
+        if not log_requests:
+            return
+        
+        # Log response
+        log_info(
+            f"Response: {method} {path} → {status_code}",
+            status_code=status_code,
+            response_time_ms=response_time_ms,
+            client_ip=client_ip
+        )
+    
+    def _log_incoming(self, scope: Scope, method: str, path: str, client_ip: str) -> None:
+        """
+        Log an incoming request.
+        
+        Logged up front so requests that never complete still leave a trace.
+        
+        Args:
+            scope: ASGI connection scope
+            method: HTTP method
+            path: Request path
+            client_ip: Client IP address
+        """
+        query_string = scope.get("query_string", b"")
+        
+        # Pick both headers out in one pass (ASGI header names are lowercased)
+        authorization = user_agent = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+            elif name == b"user-agent":
+                user_agent = value
+            if authorization is not None and user_agent is not None:
+                break
+        
+        # Truncate UA before decoding
+        user_agent = user_agent[:50].decode("latin-1") if user_agent is not None else "unknown"
+        
+        # Extract API key (if present) - truncate for security
+        api_key = parse_api_key(authorization, query_string)
+        if api_key is not None:
+            api_key = api_key[:8].decode("latin-1") + "..." if len(api_key) > 8 else api_key.decode("latin-1")
+        
+        log_info(
+            f"Incoming request: {method} {path}",
+            client_ip=client_ip,
+            query_params=query_string.decode("latin-1") if query_string else None,
+            api_key=api_key,
+            user_agent=user_agent or None
+        )
@@ -3,17 +3,87 @@ Rate limiting middleware.
 Limits the number of requests per API key or IP address.
 """
 
+import asyncio
 import time
-from typing import Callable, Dict, Optional
+from array import array
+from os import urandom
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
-from datetime import datetime, timedelta
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
-from app.utils.exceptions import RateLimitExceededException
+from app.core.security import extract_api_key
+from app.middleware.health import is_health_path
 from app.utils.logger import log_warning
+from app.utils.timestamps import utc_now_iso
+
+
+# Rate-limit windows are measured on the monotonic clock, so NTP steps or
+# manual clock changes can't shift them
+_now = time.monotonic
+
+# Number of RateLimiter shards (power of two, so hash & mask picks a shard)
+_SHARD_COUNT = 16
+_SHARD_MASK = _SHARD_COUNT - 1
+
+# 429 response body; only retry_after, limit and timestamp vary per response
+_RATE_LIMIT_BODY_TEMPLATE = (
+    b'{"error":{"code":"RATE_LIMIT_EXCEEDED",'
+    b'"message":"Rate limit exceeded. Try again in %d seconds.",'
+    b'"retry_after":%d,"limit":%d,"window":"1 hour","status":429,'
+    b'"timestamp":"%s"}}'
+)
+
+
+class _TimestampRing:
+    """
+    Compact circular buffer of request timestamps, oldest first.
+    
+    Timestamps are stored unboxed in an ``array('d')`` (8 bytes each), which
+    grows geometrically up to ``capacity`` and then wraps in place.
+    """
+    
+    __slots__ = ("buf", "head", "count", "capacity")
+    
+    def __init__(self, capacity: int):
+        self.buf = array("d")
+        self.head = 0
+        self.count = 0
+        self.capacity = capacity
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def oldest(self) -> float:
+        """Return the oldest timestamp (buffer must not be empty)."""
+        return self.buf[self.head]
+    
+    def evict_until(self, cutoff: float) -> None:
+        """Drop timestamps less than or equal to cutoff."""
+        buf = self.buf
+        size = len(buf)
+        while self.count and buf[self.head] <= cutoff:
+            self.head += 1
+            if self.head == size:
+                self.head = 0
+            self.count -= 1
+    
+    def append(self, timestamp: float) -> None:
+        """Add a timestamp (caller keeps count below capacity)."""
+        size = len(self.buf)
+        if self.count == size:
+            # Full: unwrap so the oldest entry is at index 0, then grow
+            if self.head:
+                self.buf = self.buf[self.head:] + self.buf[:self.head]
+                self.head = 0
+            new_size = min(self.capacity, max(8, size * 2))
+            self.buf.extend(array("d", bytes(8 * (new_size - size))))
+            size = new_size
+        index = self.head + self.count
+        if index >= size:
+            index -= size
+        self.buf[index] = timestamp
+        self.count += 1
 
 
 class RateLimiter:
@@ -32,8 +102,40 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        # Store: {identifier: [(timestamp1, timestamp2, ...)]}
-        self.requests: Dict[str, list] = defaultdict(list)
+        # Store: {identifier: ring of timestamps, oldest first}, split into
+        # independent shards by hash(identifier) so each dict stays small
+        self._shards: List[Dict[str, _TimestampRing]] = [
+            defaultdict(lambda: _TimestampRing(self.max_requests))
+            for _ in range(_SHARD_COUNT)
+        ]
+        # Incremental sweep: one shard every window/_SHARD_COUNT seconds,
+        # so every shard is swept once per window
+        self._sweep_interval = window_seconds / _SHARD_COUNT
+        self._next_sweep_at = _now() + self._sweep_interval
+        self._next_sweep_shard = 0
+    
+    def _shard(self, identifier: str) -> Dict[str, _TimestampRing]:
+        """Get the shard holding the given identifier."""
+        return self._shards[hash(identifier) & _SHARD_MASK]
+    
+    def _maybe_sweep(self, now: float) -> None:
+        """
+        Drop identifiers with no requests left in the window from one shard.
+        
+        Without this, every identifier ever seen would stay in memory forever.
+        """
+        if now < self._next_sweep_at:
+            return
+        self._next_sweep_at = now + self._sweep_interval
+        
+        shard = self._shards[self._next_sweep_shard]
+        self._next_sweep_shard = (self._next_sweep_shard + 1) & _SHARD_MASK
+        
+        window_start = now - self.window_seconds
+        for identifier, requests in list(shard.items()):
+            requests.evict_until(window_start)
+            if not requests:
+                del shard[identifier]
     
     def is_allowed(self, identifier: str) -> tuple[bool, Optional[int]]:
         """
@@ -45,29 +147,24 @@ class RateLimiter:
         Returns:
             tuple: (is_allowed, retry_after_seconds)
         """
-        now = time.time()
+        now = _now()
         window_start = now - self.window_seconds
+        self._maybe_sweep(now)
         
         # Get requests for this identifier
-        requests = self.requests[identifier]
+        requests = self._shard(identifier)[identifier]
         
-        # Remove old requests outside the window
-        self.requests[identifier] = [
-            req_time for req_time in requests
-            if req_time > window_start
-        ]
+        # Remove old requests outside the window (timestamps are in arrival order)
+        requests.evict_until(window_start)
         
         # Check if limit exceeded
-        current_count = len(self.requests[identifier])
-        
-        if current_count >= self.max_requests:
-            # Calculate retry after time
-            oldest_request = min(self.requests[identifier])
-            retry_after = int(oldest_request + self.window_seconds - now)
+        if len(requests) >= self.max_requests:
+            # Calculate retry after time from the oldest request in the window
+            retry_after = int(requests.oldest() + self.window_seconds - now)
             return False, max(retry_after, 1)
         
         # Add current request
-        self.requests[identifier].append(now)
+        requests.append(now)
         return True, None
     
     def get_usage(self, identifier: str) -> dict:
@@ -80,83 +177,244 @@ class RateLimiter:
         Returns:
             dict: Usage statistics
         """
-        now = time.time()
+        now = _now()
         window_start = now - self.window_seconds
         
         # Clean old requests
-        requests = [
-            req_time for req_time in self.requests.get(identifier, [])
-            if req_time > window_start
-        ]
+        requests = self._shard(identifier).get(identifier)
+        used = 0
+        if requests:
+            requests.evict_until(window_start)
+            used = len(requests)
         
         return {
-            "used": len(requests),
+            "used": used,
             "limit": self.max_requests,
-            "remaining": max(0, self.max_requests - len(requests)),
-            "reset_at": int(now + self.window_seconds) if requests else None
+            "remaining": max(0, self.max_requests - used),
+            # Reset time is reported as a Unix timestamp (wall clock)
+            "reset_at": int(time.time() + self.window_seconds) if used else None
         }
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Sliding-window check-and-record as one atomic Redis call.
+# KEYS[1] = identifier key; ARGV = now_ms, window_ms, max_requests, member.
+# Returns {allowed, oldest_ms, count}.
+_REDIS_SLIDING_WINDOW = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, tonumber(oldest[2]), count}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, now, count + 1}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Rate limiter backed by Redis, shared by all workers and instances.
+    
+    Each check is a single EVALSHA of a sliding-window Lua script. Callers
+    fall back to the in-process RateLimiter when this returns None.
+    """
+    
+    def __init__(
+        self,
+        client,
+        max_requests: int,
+        window_seconds: int,
+        timeout_seconds: float,
+        cooldown_seconds: float
+    ):
+        """
+        Initialize Redis rate limiter.
+        
+        Args:
+            client: redis.asyncio client
+            max_requests: Maximum number of requests allowed
+            window_seconds: Time window in seconds
+            timeout_seconds: Deadline for one Redis round-trip
+            cooldown_seconds: How long to skip Redis after a failed call
+        """
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.timeout_seconds = timeout_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._window_ms = window_seconds * 1000
+        self._client = client
+        self._script = client.register_script(_REDIS_SLIDING_WINDOW)
+        # Monotonic time until which Redis is skipped after a failure
+        self._skip_until = 0.0
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisRateLimiter":
+        """
+        Create a limiter with a client for the given Redis URL.
+        
+        Args:
+            url: Redis connection URL
+            **kwargs: Limiter settings passed to __init__
+        
+        Returns:
+            RedisRateLimiter: New limiter
+        """
+        # Imported lazily: redis is only needed when a Redis URL is configured
+        from redis import asyncio as redis_asyncio
+        
+        return cls(redis_asyncio.from_url(url), **kwargs)
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._client.aclose()
+    
+    async def check(self, identifier: str) -> Optional[Tuple[bool, Optional[int], Optional[dict]]]:
+        """
+        Check and record a request for given identifier.
+        
+        Args:
+            identifier: Unique identifier (API key or IP)
+        
+        Returns:
+            tuple: (is_allowed, retry_after_seconds, usage), or None if Redis is unavailable
+        """
+        # While Redis is cooling down after a failure, don't wait on it again
+        if _now() < self._skip_until:
+            return None
+        
+        # Wall clock: the window is shared between hosts
+        now = time.time()
+        now_ms = int(now * 1000)
+        try:
+            allowed, oldest_ms, count = await asyncio.wait_for(
+                self._script(
+                    keys=[f"rate_limit:{identifier}"],
+                    args=[now_ms, self._window_ms, self.max_requests, f"{now_ms}-{urandom(4).hex()}"],
+                ),
+                self.timeout_seconds
+            )
+        except Exception as e:
+            # Logged once per cooldown instead of on every request
+            self._skip_until = _now() + self.cooldown_seconds
+            log_warning(
+                "Redis rate limiter unavailable, using local limiter",
+                error=str(e) or type(e).__name__,
+                retry_in=self.cooldown_seconds
+            )
+            return None
+        
+        if not allowed:
+            retry_after = -(-(int(oldest_ms) + self._window_ms - now_ms) // 1000)
+            return False, max(retry_after, 1), None
+        
+        return True, None, {
+            "used": count,
+            "limit": self.max_requests,
+            "remaining": max(0, self.max_requests - count),
+            "reset_at": int(now + self.window_seconds)
+        }
+
+
+# Redis limiters created by middleware instances, closed on app shutdown
+_redis_limiters: List[RedisRateLimiter] = []
+
+
+async def close_redis_limiters() -> None:
+    """Close the Redis clients of all rate limit middleware instances."""
+    while _redis_limiters:
+        await _redis_limiters.pop().close()
+
+
+class RateLimitMiddleware:
     """
     Middleware for rate limiting requests.
     Limits requests per API key or IP address.
+    
+    Implemented as a plain ASGI middleware (not BaseHTTPMiddleware) so a
+    request passes through it without an extra task and memory channel.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         # Rate limiter: 1000 requests per hour (3600 seconds)
         self.limiter = RateLimiter(
             max_requests=settings.RATE_LIMIT_PER_HOUR,
             window_seconds=3600
         )
+        # Optional shared limiter; the in-process one stays as its fallback
+        self.redis_limiter = None
+        if settings.RATE_LIMIT_REDIS_URL:
+            self.redis_limiter = RedisRateLimiter.from_url(
+                settings.RATE_LIMIT_REDIS_URL,
+                max_requests=self.limiter.max_requests,
+                window_seconds=self.limiter.window_seconds,
+                timeout_seconds=settings.RATE_LIMIT_REDIS_TIMEOUT,
+                cooldown_seconds=settings.RATE_LIMIT_REDIS_COOLDOWN
+            )
+            _redis_limiters.append(self.redis_limiter)
+        # The limit never changes, so its header is encoded once
+        self._limit_header = (b"x-ratelimit-limit", b"%d" % self.limiter.max_requests)
     
-    def _get_identifier(self, request: Request) -> str:
+    def _get_identifier(self, scope: Scope) -> str:
         """
         Get unique identifier for rate limiting.
         Prefers API key, falls back to IP address.
         
         Args:
-            request: Incoming request
+            scope: ASGI scope of the incoming request
         
         Returns:
             str: Unique identifier
         """
-        # Try to get API key from header
-        auth_header = request.headers.get("authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            api_key = auth_header.replace("Bearer ", "")
-            return f"api_key:{api_key}"
-        
-        # Try to get API key from query params
-        query_params = dict(request.query_params)
-        if "api_key" in query_params:
-            return f"api_key:{query_params['api_key']}"
+        # Try to get API key from the Authorization header or query string
+        api_key = extract_api_key(scope)
+        if api_key is not None:
+            return f"api_key:{api_key.decode('latin-1')}"
         
         # Fall back to IP address
-        client_ip = request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         return f"ip:{client_ip}"
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def _check(self, identifier: str) -> Tuple[bool, Optional[int], Optional[dict]]:
         """
-        Check rate limit before processing request.
+        Check rate limit with Redis when configured, else the local limiter.
         
         Args:
-            request: Incoming request
-            call_next: Next middleware/handler
+            identifier: Unique identifier
         
         Returns:
-            Response: HTTP response or 429 if rate limit exceeded
+            tuple: (is_allowed, retry_after_seconds, usage if allowed)
         """
-        # Skip rate limiting for health check endpoints
-        if request.url.path.startswith("/api/v1/health"):
-            return await call_next(request)
+        if self.redis_limiter is not None:
+            result = await self.redis_limiter.check(identifier)
+            if result is not None:
+                return result
+        
+        is_allowed, retry_after = self.limiter.is_allowed(identifier)
+        usage = self.limiter.get_usage(identifier) if is_allowed else None
+        return is_allowed, retry_after, usage
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Check rate limit before processing request.
+        
+        Sends a 429 response if the limit is exceeded, otherwise forwards the
+        request and adds rate limit headers to the response start message.
+        """
+        # Skip rate limiting for non-HTTP traffic and health check endpoints
+        if scope["type"] != "http" or is_health_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
         
         # Get identifier
-        identifier = self._get_identifier(request)
+        identifier = self._get_identifier(scope)
         
         # Check rate limit
-        is_allowed, retry_after = self.limiter.is_allowed(identifier)
+        is_allowed, retry_after, usage = await self._check(identifier)
         
         if not is_allowed:
             # Log rate limit exceeded
@@ -166,39 +424,39 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 retry_after=retry_after
             )
             
-            # Return 429 response
-            from fastapi.responses import JSONResponse
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "error": {
-                        "code": "RATE_LIMIT_EXCEEDED",
-                        "message": f"Rate limit exceeded. Try again in {retry_after} seconds.",
-                        "retry_after": retry_after,
-                        "limit": settings.RATE_LIMIT_PER_HOUR,
-                        "window": "1 hour",
-                        "status": 429,
-                        "timestamp": datetime.utcnow().isoformat() + "Z"
-                    }
-                },
-                headers={
-                    "Retry-After": str(retry_after),
-                    "X-RateLimit-Limit": str(settings.RATE_LIMIT_PER_HOUR),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(time.time()) + retry_after)
-                }
+            # Return 429 response (body filled into the precomputed template)
+            limit = self.limiter.max_requests
+            body = _RATE_LIMIT_BODY_TEMPLATE % (
+                retry_after, retry_after, limit, utc_now_iso().encode("ascii")
             )
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", b"%d" % len(body)),
+                    (b"retry-after", b"%d" % retry_after),
+                    self._limit_header,
+                    (b"x-ratelimit-remaining", b"0"),
+                    (b"x-ratelimit-reset", b"%d" % (int(time.time()) + retry_after)),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
         
-        # Get usage stats
-        usage = self.limiter.get_usage(identifier)
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit"] = str(settings.RATE_LIMIT_PER_HOUR)
-        response.headers["X-RateLimit-Remaining"] = str(usage["remaining"])
+        # Encode the per-request header values once, before the response starts
+        rate_limit_headers = [
+            self._limit_header,
+            (b"x-ratelimit-remaining", b"%d" % usage["remaining"]),
+        ]
         if usage["reset_at"]:
-            response.headers["X-RateLimit-Reset"] = str(usage["reset_at"])
+            rate_limit_headers.append((b"x-ratelimit-reset", b"%d" % usage["reset_at"]))
         
-        return response
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers straight to the raw header list
+                message["headers"] = [*message.get("headers", ()), *rate_limit_headers]
+            await send(message)
+        
+        # Process request
+        await self.app(scope, receive, send_with_rate_limit_headers)
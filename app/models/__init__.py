@@ -7,6 +7,7 @@ from app.models.response import (
     NewsListResponse,
     NewsDetailResponse,
     AggregationResponse,
+    DashboardResponse,
     ErrorResponse,
     PaginationMeta,
     ResponseMetadata
@@ -20,6 +21,7 @@ __all__ = [
     "NewsListResponse",
     "NewsDetailResponse",
     "AggregationResponse",
+    "DashboardResponse",
     "ErrorResponse",
     "PaginationMeta",
     "ResponseMetadata",
@@ -12,6 +12,10 @@ class AssetBase(BaseModel):
     name: Optional[str] = Field(None, description="Full name of the asset")
     slug: Optional[str] = Field(None, description="URL-friendly identifier")
     symbol: str = Field(..., description="Trading symbol (e.g., BTC, ETH, LSE:AWE)")
+    
+    class Config:
+        # Response-only models are never mutated
+        frozen = True
 
 
 class Asset(AssetBase):
@@ -21,6 +21,10 @@ class NewsBase(BaseModel):
     sourceUrl: str = Field(..., description="Original article URL")
     releasedAt: datetime = Field(..., description="Article publication date")
     assets: List[Asset] = Field(default=[], description="Related assets/cryptocurrencies")
+    
+    class Config:
+        # Response-only models are never mutated
+        frozen = True
 
 
 class NewsInDB(NewsBase):
@@ -50,6 +54,7 @@ class NewsListItem(BaseModel):
     assets: List[Asset] = []
     
     class Config:
+        frozen = True
         json_schema_extra = {
             "example": {
                 "slug": "bitcoin-hits-new-high",
@@ -3,14 +3,17 @@ Request schemas for API endpoints.
 Defines query parameters and validation rules.
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 from app.config import settings
 
 
+_UTC = timezone.utc
+
+
 class SortOrder(str, Enum):
     """Sort order enum."""
     ASC = "asc"
@@ -77,32 +80,33 @@ class NewsQueryParams(BaseModel):
     
     @field_validator("start", "end")
     @classmethod
-    def validate_dates(cls, v: Optional[datetime]) -> Optional[datetime]:
-        """Ensure dates are not in the future."""
-        if v:
-            # Handle both timezone-aware and timezone-naive datetimes
-            from datetime import timezone
-            now = datetime.now(timezone.utc)
-            
-            # Make v timezone-aware if it's naive
-            if v.tzinfo is None:
-                # Assume UTC for naive datetimes
-                v = v.replace(tzinfo=timezone.utc)
-            
-            if v > now:
-                raise ValueError("Date cannot be in the future")
+    def make_dates_aware(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Assume UTC for naive datetimes."""
+        if v is not None and v.tzinfo is None:
+            v = v.replace(tzinfo=_UTC)
         return v
     
-    @field_validator("end")
-    @classmethod
-    def validate_date_range(cls, v: Optional[datetime], info) -> Optional[datetime]:
-        """Ensure end is after start."""
-        start = info.data.get("start")
-        if v and start and v < start:
-            raise ValueError("end must be after start")
-        return v
+    @model_validator(mode="after")
+    def validate_dates(self) -> "NewsQueryParams":
+        """Ensure dates are not in the future and end is after start."""
+        start, end = self.start, self.end
+        if start is None and end is None:
+            return self
+        
+        # One clock read covers both fields
+        now = datetime.now(_UTC)
+        if start is not None and start > now:
+            raise ValueError("start cannot be in the future")
+        if end is not None:
+            if end > now:
+                raise ValueError("end cannot be in the future")
+            if start is not None and end < start:
+                raise ValueError("end must be after start")
+        return self
     
     class Config:
+        # Immutable, so validated instances can be shared between requests
+        frozen = True
         json_schema_extra = {
             "example": {
                 "start": "2025-01-01T00:00:00Z",
@@ -4,15 +4,12 @@ Defines standard response formats with pagination and metadata.
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Generic, TypeVar
+from typing import List, Optional
 from datetime import datetime
 
 from app.models.news import NewsListItem, NewsDetail
 
 
-DataT = TypeVar('DataT')
-
-
 class PaginationMeta(BaseModel):
     """Pagination metadata for cursor-based pagination."""
     next_cursor: Optional[str] = Field(
@@ -29,6 +26,8 @@ class PaginationMeta(BaseModel):
     returned: int = Field(..., description="Number of items actually returned")
     
     class Config:
+        # Built once per response and never mutated
+        frozen = True
         json_schema_extra = {
             "example": {
                 "next_cursor": "eyJfaWQiOiI2NWUxMjM0NTY3ODkwYWJjZGVmMDEyMzQiLCJyZWxlYXNlZEF0IjoiMjAyNS0wMi0yNlQxMjowMDowMFoifQ==",
@@ -57,29 +56,16 @@ class ResponseMetadata(BaseModel):
     )
     
     class Config:
+        frozen = True
         json_schema_extra = {
             "example": {
                 "query_time_ms": 45.32,
-                "timestamp": "2025-11-22T00:15:23.445678",
+                "timestamp": "2025-11-22T00:15:23Z",
                 "api_version": "1.0.0"
             }
         }
 
 
-class StandardResponse(BaseModel, Generic[DataT]):
-    """Standard API response with success flag, data, pagination, and metadata."""
-    success: bool = Field(
-        True,
-        description="Whether the request was successful"
-    )
-    data: List[DataT] = Field(..., description="Response data")
-    pagination: Optional[PaginationMeta] = Field(
-        None,
-        description="Pagination metadata (for paginated endpoints)"
-    )
-    metadata: ResponseMetadata = Field(..., description="Response metadata")
-
-
 class NewsListResponse(BaseModel):
     """Response for news list endpoint."""
     success: bool = Field(
@@ -122,7 +108,7 @@ class NewsListResponse(BaseModel):
                 },
                 "metadata": {
                     "query_time_ms": 45.32,
-                    "timestamp": "2025-11-22T00:15:23.445678",
+                    "timestamp": "2025-11-22T00:15:23Z",
                     "api_version": "1.0.0"
                 }
             }
@@ -163,7 +149,7 @@ class NewsDetailResponse(BaseModel):
                 },
                 "metadata": {
                     "query_time_ms": 12.45,
-                    "timestamp": "2025-11-22T00:15:23.445678",
+                    "timestamp": "2025-11-22T00:15:23Z",
                     "api_version": "1.0.0"
                 }
             }
@@ -177,6 +163,28 @@ class AggregationResponse(BaseModel):
         description="Whether the request was successful"
     )
     data: List[dict] = Field(..., description="Aggregation results")
+    filters: dict = Field(default_factory=dict, description="Filters applied to the aggregation")
+    total: Optional[int] = Field(None, description="Total count across all results (stats and dashboard only)")
+    metadata: ResponseMetadata = Field(..., description="Response metadata")
+
+
+class DashboardData(BaseModel):
+    """All dashboard aggregations, computed from one date window."""
+    by_source: List[dict] = Field(..., description="News count per source")
+    timeline: List[dict] = Field(..., description="Daily news count")
+    top_assets: List[dict] = Field(..., description="Most mentioned assets with percentages")
+    source_performance: List[dict] = Field(..., description="Per-source performance statistics")
+
+
+class DashboardResponse(BaseModel):
+    """Response for the combined dashboard aggregation endpoint."""
+    success: bool = Field(
+        True,
+        description="Whether the request was successful"
+    )
+    data: DashboardData = Field(..., description="Dashboard aggregations")
+    filters: dict = Field(default_factory=dict, description="Filters applied to the aggregations")
+    total: int = Field(..., description="Total news matching the filters")
     metadata: ResponseMetadata = Field(..., description="Response metadata")
 
 
@@ -188,6 +196,7 @@ class ErrorDetail(BaseModel):
     timestamp: str = Field(..., description="Error timestamp (ISO 8601)")
     
     class Config:
+        frozen = True
         json_schema_extra = {
             "example": {
                 "code": "NEWS_NOT_FOUND",
@@ -207,6 +216,7 @@ class ErrorResponse(BaseModel):
     error: ErrorDetail = Field(..., description="Error details")
     
     class Config:
+        frozen = True
         json_schema_extra = {
             "example": {
                 "success": False,
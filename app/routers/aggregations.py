@@ -3,32 +3,179 @@ Aggregation router.
 Provides endpoints for news analytics and statistics.
 """
 
-from fastapi import APIRouter, Depends, Query, HTTPException
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Annotated, Optional
-from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from functools import lru_cache, wraps
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable, List, Literal, Optional, Union
+import inspect
+import orjson
 import time
 
-from app.services.aggregation_service import AggregationService
-from app.dependencies import get_db, get_current_api_key
-from app.models.response import AggregationResponse, ResponseMetadata
+from app.services.aggregation_service import AggregationService, cached_result_entry
+from app.dependencies import get_agg_service, get_current_api_key
+from app.models.response import AggregationResponse, DashboardResponse
+from app.utils.dates import parse_iso
 from app.utils.logger import log_info
+from app.utils.response import response_metadata
 
 
-router = APIRouter(prefix="/aggregations", tags=["Aggregations"])
+router = APIRouter(
+    prefix="/aggregations",
+    tags=["Aggregations"],
+    default_response_class=ORJSONResponse
+)
+
+# Endpoint arguments that are not echoed back as filters
+_NON_FILTER_ARGS = ("agg_service", "api_key")
+
+# Extra endpoint argument the wrapper uses to read conditional request headers
+_REQUEST_ARG = "_request"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _aggregation_response(
+    data: Union[List[dict], dict],
+    filters: dict,
+    metadata: dict,
+    total: Optional[int] = None
+) -> Response:
+    """
+    Build an AggregationResponse-shaped response serialized with orjson.
+    
+    The payload is plain dicts from the trusted aggregation pipeline, so it
+    is encoded to bytes in one orjson call; AggregationResponse only
+    documents the schema.
+    
+    Args:
+        data: Aggregation results
+        filters: Filters applied to the aggregation
+        metadata: Response metadata (see response_metadata)
+        total: Total count across all results (if applicable)
+    
+    Returns:
+        Response: Aggregation response
+    """
+    content = {
+        "success": True,
+        "data": data,
+        "filters": filters,
+        "metadata": metadata
+    }
+    if total is not None:
+        content["total"] = total
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_UTC_Z),
+        media_type="application/json"
+    )
+
+
+async def _ndjson(docs: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode documents as newline-delimited JSON, one line per document."""
+    async for doc in docs:
+        yield orjson.dumps(doc, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+
+
+def aggregation_endpoint(name: str) -> Callable:
+    """
+    Wrap an aggregation endpoint with the shared request handling.
+    
+    The wrapper times the call, parses the ``start``/``end`` query strings
+    into datetimes before the endpoint runs, logs the result and builds the
+    response. Query arguments are echoed back as ``filters`` in their raw
+    form. The endpoint returns its data list, or ``(data, total)``, or a
+    ready-made Response (e.g. a stream), which is returned as-is.
+    
+    Responses served from the aggregation result cache carry the cache
+    entry's ``ETag`` and a ``Cache-Control`` max-age of its remaining
+    lifetime; a matching ``If-None-Match`` gets an empty 304 without
+    serializing the body. Uncached results (e.g. streams) get neither.
+    
+    FastAPI reads the endpoint's signature, plus the request, from the
+    wrapper's ``__signature__``.
+    
+    Args:
+        name: Aggregation name used in the completion log line
+    """
+    def decorator(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Response]]:
+        signature = inspect.signature(endpoint)
+        filter_names = tuple(p for p in signature.parameters if p not in _NON_FILTER_ARGS)
+        
+        @lru_cache(maxsize=4096)
+        def filter_echo(filter_items: tuple) -> dict:
+            # Shared between responses, which only read it
+            return dict(filter_items)
+        
+        @wraps(endpoint)
+        async def wrapper(**kwargs: Any) -> Response:
+            start_time = time.perf_counter_ns()
+            request: Request = kwargs.pop(_REQUEST_ARG)
+            
+            filters = filter_echo(tuple((k, kwargs[k]) for k in filter_names))
+            if "start" in kwargs:
+                kwargs["start"] = parse_iso(kwargs["start"])
+            if "end" in kwargs:
+                kwargs["end"] = parse_iso(kwargs["end"])
+            
+            cached_result_entry.set(None)
+            result = await endpoint(**kwargs)
+            if isinstance(result, Response):
+                return result
+            
+            headers = None
+            entry = cached_result_entry.get()
+            if entry is not None:
+                etag, expires_at = entry
+                max_age = max(0, int(expires_at - time.monotonic()))
+                headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+                if _etag_matches(request.headers.get("if-none-match"), etag):
+                    return Response(status_code=304, headers=headers)
+            
+            data, total = result if isinstance(result, tuple) else (result, None)
+            
+            metadata = response_metadata(start_time)
+            
+            log_info(
+                f"{name} aggregation completed",
+                results=len(data),
+                query_time_ms=metadata["query_time_ms"],
+                **filters
+            )
+            
+            response = _aggregation_response(data, filters, metadata, total=total)
+            if headers is not None:
+                response.headers.update(headers)
+            return response
+        
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(_REQUEST_ARG, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        ])
+        return wrapper
+    
+    return decorator
 
 
 @router.get(
     "/stats",
-    response_model=AggregationResponse,
+    responses={200: {"model": AggregationResponse}},
     summary="Get news statistics",
     description="Get aggregated news statistics grouped by various dimensions"
 )
+@aggregation_endpoint("stats")
 async def get_stats(
-    group_by: Annotated[str, Query(description="Group by: source, date")] = "source",
+    group_by: Annotated[Literal["source", "date"], Query(description="Group by: source, date")] = "source",
     start: Annotated[str | None, Query(description="Filter from date (ISO 8601)")] = None,
     end: Annotated[str | None, Query(description="Filter to date (ISO 8601)")] = None,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    agg_service: AggregationService = Depends(get_agg_service),
     api_key: str = Depends(get_current_api_key),
 ):
     """
@@ -43,75 +190,24 @@ async def get_stats(
     GET /api/v1/aggregations/stats?group_by=source&start=2025-11-01&end=2025-11-30
     ```
     """
-    # Start timer
-    start_time = time.time()
-    
-    # Parse dates
-    parsed_start = None
-    parsed_end = None
-    
-    if start:
-        parsed_start = datetime.fromisoformat(start.replace('Z', '+00:00') if 'Z' in start else start)
-    if end:
-        parsed_end = datetime.fromisoformat(end.replace('Z', '+00:00') if 'Z' in end else end)
-    
-    # Get aggregation service
-    agg_service = AggregationService(db)
-    
-    # Execute aggregation based on group_by
-    if group_by == "source":
-        data = await agg_service.get_stats_by_source(parsed_start, parsed_end)
-        total = sum(item["count"] for item in data)
-    elif group_by == "date":
-        data = await agg_service.get_timeline("daily", parsed_start, parsed_end)
-        total = sum(item["count"] for item in data)
-    else:
-        raise HTTPException(status_code=400, detail=f"Invalid group_by value: {group_by}")
-    
-    # Calculate query time
-    query_time_ms = (time.time() - start_time) * 1000
-    
-    # Add filters and total to each result
-    result_data = [{
-        **item,
-        "filters": {
-            "group_by": group_by,
-            "start": start,
-            "end": end
-        },
-        "total": total
-    } for item in data]
-    
-    log_info(
-        "Stats aggregation completed",
-        group_by=group_by,
-        results=len(data),
-        query_time_ms=round(query_time_ms, 2)
-    )
-    
-    return AggregationResponse(
-        success=True,
-        data=result_data,
-        metadata=ResponseMetadata(
-            query_time_ms=round(query_time_ms, 2),
-            timestamp=datetime.utcnow().isoformat(),
-            api_version="1.0.0"
-        )
-    )
+    # Buckets and total come from one pipeline
+    stats = await agg_service.get_stats(group_by, start, end)
+    return stats["buckets"], stats["total"]
 
 
 @router.get(
     "/top-assets",
-    response_model=AggregationResponse,
+    responses={200: {"model": AggregationResponse}},
     summary="Get top mentioned assets",
     description="Get the most frequently mentioned assets in news"
 )
+@aggregation_endpoint("top_assets")
 async def get_top_assets(
     limit: Annotated[int, Query(description="Number of top assets", ge=1, le=100)] = 10,
     start: Annotated[str | None, Query(description="Filter from date (ISO 8601)")] = None,
     end: Annotated[str | None, Query(description="Filter to date (ISO 8601)")] = None,
     source: Annotated[str | None, Query(description="Filter by source")] = None,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    agg_service: AggregationService = Depends(get_agg_service),
     api_key: str = Depends(get_current_api_key),
 ):
     """
@@ -124,68 +220,29 @@ async def get_top_assets(
     GET /api/v1/aggregations/top-assets?limit=10&source=bloomberg
     ```
     """
-    # Start timer
-    start_time = time.time()
-    
-    # Parse dates
-    parsed_start = None
-    parsed_end = None
-    
-    if start:
-        parsed_start = datetime.fromisoformat(start.replace('Z', '+00:00') if 'Z' in start else start)
-    if end:
-        parsed_end = datetime.fromisoformat(end.replace('Z', '+00:00') if 'Z' in end else end)
-    
-    # Get aggregation service
-    agg_service = AggregationService(db)
-    
-    # Get top assets
-    data = await agg_service.get_top_assets(limit, parsed_start, parsed_end, source)
-    
-    # Calculate query time
-    query_time_ms = (time.time() - start_time) * 1000
-    
-    # Add filters to each result
-    result_data = [{
-        **item,
-        "filters": {
-            "limit": limit,
-            "start": start,
-            "end": end,
-            "source": source
-        }
-    } for item in data]
-    
-    log_info(
-        "Top assets fetched",
-        limit=limit,
-        results=len(data),
-        query_time_ms=round(query_time_ms, 2)
-    )
-    
-    return AggregationResponse(
-        success=True,
-        data=result_data,
-        metadata=ResponseMetadata(
-            query_time_ms=round(query_time_ms, 2),
-            timestamp=datetime.utcnow().isoformat(),
-            api_version="1.0.0"
-        )
-    )
+    return await agg_service.get_top_assets(limit, start, end, source)
 
 
 @router.get(
     "/timeline",
-    response_model=AggregationResponse,
+    responses={200: {"model": AggregationResponse}},
     summary="Get news timeline",
     description="Get news count over time with configurable intervals"
 )
+@aggregation_endpoint("timeline")
 async def get_timeline(
-    interval: Annotated[str, Query(description="Time interval: daily, weekly, monthly")] = "daily",
+    interval: Annotated[
+        Literal["daily", "weekly", "monthly"],
+        Query(description="Time interval: daily, weekly, monthly")
+    ] = "daily",
     start: Annotated[str | None, Query(description="Filter from date (ISO 8601)")] = None,
     end: Annotated[str | None, Query(description="Filter to date (ISO 8601)")] = None,
     source: Annotated[str | None, Query(description="Filter by source")] = None,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    format: Annotated[
+        Literal["json", "ndjson"],
+        Query(description="Response format: json (envelope), ndjson (streamed periods)")
+    ] = "json",
+    agg_service: AggregationService = Depends(get_agg_service),
     api_key: str = Depends(get_current_api_key),
 ):
     """
@@ -196,75 +253,33 @@ async def get_timeline(
     - `weekly`: Group by week
     - `monthly`: Group by month
     
+    With `format=ndjson` the periods are streamed as newline-delimited JSON
+    as they are read from MongoDB, without the response envelope.
+    
     **Example:**
     ```
     GET /api/v1/aggregations/timeline?interval=daily&start=2025-11-01&end=2025-11-30
     ```
     """
-    # Start timer
-    start_time = time.time()
-    
-    # Validate interval
-    if interval not in ["daily", "weekly", "monthly"]:
-        raise HTTPException(status_code=400, detail=f"Invalid interval: {interval}")
-    
-    # Parse dates
-    parsed_start = None
-    parsed_end = None
-    
-    if start:
-        parsed_start = datetime.fromisoformat(start.replace('Z', '+00:00') if 'Z' in start else start)
-    if end:
-        parsed_end = datetime.fromisoformat(end.replace('Z', '+00:00') if 'Z' in end else end)
-    
-    # Get aggregation service
-    agg_service = AggregationService(db)
-    
-    # Get timeline
-    data = await agg_service.get_timeline(interval, parsed_start, parsed_end, source)
-    
-    # Calculate query time
-    query_time_ms = (time.time() - start_time) * 1000
-    
-    # Add filters to each result
-    result_data = [{
-        **item,
-        "filters": {
-            "interval": interval,
-            "start": start,
-            "end": end,
-            "source": source
-        }
-    } for item in data]
-    
-    log_info(
-        "Timeline fetched",
-        interval=interval,
-        results=len(data),
-        query_time_ms=round(query_time_ms, 2)
-    )
-    
-    return AggregationResponse(
-        success=True,
-        data=result_data,
-        metadata=ResponseMetadata(
-            query_time_ms=round(query_time_ms, 2),
-            timestamp=datetime.utcnow().isoformat(),
-            api_version="1.0.0"
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson(agg_service.stream_timeline(interval, start, end, source)),
+            media_type="application/x-ndjson"
         )
-    )
+    return await agg_service.get_timeline(interval, start, end, source)
 
 
 @router.get(
     "/source-performance",
-    response_model=AggregationResponse,
+    responses={200: {"model": AggregationResponse}},
     summary="Get source performance statistics",
     description="Get detailed performance statistics for each news source"
 )
+@aggregation_endpoint("source_performance")
 async def get_source_performance(
     start: Annotated[str | None, Query(description="Filter from date (ISO 8601)")] = None,
     end: Annotated[str | None, Query(description="Filter to date (ISO 8601)")] = None,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    agg_service: AggregationService = Depends(get_agg_service),
     api_key: str = Depends(get_current_api_key),
 ):
     """
@@ -272,56 +287,48 @@ async def get_source_performance(
     
     Includes:
     - Total news count
-    - Average news per day
-    - Top mentioned assets
+    - Average news per day (when both start and end are given)
     
     **Example:**
     ```
     GET /api/v1/aggregations/source-performance?start=2025-11-01&end=2025-11-30
     ```
     """
-    # Start timer
-    start_time = time.time()
-    
-    # Parse dates
-    parsed_start = None
-    parsed_end = None
-    
-    if start:
-        parsed_start = datetime.fromisoformat(start.replace('Z', '+00:00') if 'Z' in start else start)
-    if end:
-        parsed_end = datetime.fromisoformat(end.replace('Z', '+00:00') if 'Z' in end else end)
-    
-    # Get aggregation service
-    agg_service = AggregationService(db)
-    
-    # Get source performance
-    data = await agg_service.get_source_performance(parsed_start, parsed_end)
-    
-    # Calculate query time
-    query_time_ms = (time.time() - start_time) * 1000
-    
-    # Add filters to each result
-    result_data = [{
-        **item,
-        "filters": {
-            "start": start,
-            "end": end
-        }
-    } for item in data]
+    return await agg_service.get_source_performance(start, end)
+
+
+@router.get(
+    "/dashboard",
+    responses={200: {"model": DashboardResponse}},
+    summary="Get dashboard aggregations",
+    description="Get source stats, daily timeline, top assets and source performance in one call"
+)
+@aggregation_endpoint("dashboard")
+async def get_dashboard(
+    start: Annotated[str | None, Query(description="Filter from date (ISO 8601)")] = None,
+    end: Annotated[str | None, Query(description="Filter to date (ISO 8601)")] = None,
+    source: Annotated[str | None, Query(description="Filter by source")] = None,
+    top_n: Annotated[int, Query(description="Number of top assets", ge=1, le=100)] = 10,
+    agg_service: AggregationService = Depends(get_agg_service),
+    api_key: str = Depends(get_current_api_key),
+):
+    """
+    Get all dashboard aggregations for one date window.
     
-    log_info(
-        "Source performance fetched",
-        sources=len(data),
-        query_time_ms=round(query_time_ms, 2)
-    )
+    Runs the `/stats?group_by=source`, `/timeline?interval=daily`,
+    `/top-assets` and `/source-performance` aggregations as a single
+    MongoDB pipeline, so dashboards need one request instead of four.
     
-    return AggregationResponse(
-        success=True,
-        data=result_data,
-        metadata=ResponseMetadata(
-            query_time_ms=round(query_time_ms, 2),
-            timestamp=datetime.utcnow().isoformat(),
-            api_version="1.0.0"
-        )
-    )
+    **Example:**
+    ```
+    GET /api/v1/aggregations/dashboard?start=2025-11-01&end=2025-11-30
+    ```
+    """
+    dashboard = await agg_service.get_dashboard(start, end, source, top_n)
+    data = {
+        "by_source": dashboard["by_source"],
+        "timeline": dashboard["timeline"],
+        "top_assets": dashboard["top_assets"],
+        "source_performance": dashboard["source_performance"]
+    }
+    return data, dashboard["total"]
@@ -4,14 +4,15 @@ Provides endpoints for monitoring API health and database connectivity.
 """
 
 from fastapi import APIRouter, Depends
-from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+import asyncio
 import time
 
 from app.dependencies import get_db
 from app.config import settings
 from app.core.database import db_manager
 from app.utils.logger import log_info, log_error
+from app.utils.timestamps import utc_now_iso
 
 
 router = APIRouter(prefix="/health", tags=["Health"])
@@ -38,26 +39,35 @@ async def health_check(db: AsyncIOMotorDatabase = Depends(get_db)):
     - `version`: API version
     - `query_time_ms`: Health check execution time
     """
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
      
     try:
         # Check database connection
-        db_start = datetime.utcnow()
-        is_connected = await db_manager.ping()
-        ping_duration = (datetime.utcnow() - db_start).total_seconds() * 1000
+        db_start = time.perf_counter_ns()
+        # Bounded, so a stalled cluster cannot hold up probe responses
+        try:
+            is_connected = await asyncio.wait_for(
+                db_manager.ping_cached(settings.HEALTH_PING_CACHE_TTL),
+                timeout=settings.HEALTH_PING_TIMEOUT
+            )
+            ping_error = "Failed to ping database"
+        except asyncio.TimeoutError:
+            is_connected = False
+            ping_error = "Database ping timed out"
+        ping_duration = (time.perf_counter_ns() - db_start) / 1e6
         
         # Calculate total query time
-        query_time_ms = (time.time() - start_time) * 1000
+        query_time_ms = (time.perf_counter_ns() - start_time) / 1e6
         
         if not is_connected:
-            log_error("Database connection failed")
+            log_error("Database connection failed", error=ping_error)
             return {
                 "success": False,
                 "status": "unhealthy",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utc_now_iso(),
                 "database": {
                     "connected": False,
-                    "error": "Failed to ping database"
+                    "error": ping_error
                 },
                 "version": settings.APP_VERSION,
                 "query_time_ms": round(query_time_ms, 2)
@@ -68,7 +78,7 @@ async def health_check(db: AsyncIOMotorDatabase = Depends(get_db)):
         return {
             "success": True,
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "database": {
                 "connected": True,
                 "ping_ms": round(ping_duration, 2)
@@ -78,12 +88,12 @@ async def health_check(db: AsyncIOMotorDatabase = Depends(get_db)):
         }
     
     except Exception as e:
-        query_time_ms = (time.time() - start_time) * 1000
+        query_time_ms = (time.perf_counter_ns() - start_time) / 1e6
         log_error("Health check failed", error=str(e))
         return {
             "success": False,
             "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "database": {
                 "connected": False,
                 "error": str(e)
@@ -109,13 +119,13 @@ async def readiness_check():
             "success": False,
             "ready": False,
             "reason": "Database not initialized",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
     
     return {
         "success": True,
         "ready": True,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_now_iso()
     }
 
 
@@ -132,5 +142,5 @@ async def liveness_check():
     return {
         "success": True,
         "alive": True,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_now_iso()
     }
@@ -3,28 +3,139 @@ News router.
 Handles all news-related API endpoints.
 """
 
-from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Annotated
-from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Path, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Any, AsyncIterator, Dict, List, Literal
+from functools import lru_cache
 import time
 
-from app.models.news import NewsListItem, NewsDetail
+import orjson
+
 from app.models.request import NewsQueryParams
-from app.models.response import NewsListResponse, NewsDetailResponse, ErrorResponse, ResponseMetadata
-from app.services.news_service import NewsService, get_news_service
-from app.dependencies import get_db, get_current_api_key
+from app.models.response import NewsListResponse, NewsDetailResponse, ErrorResponse
+from app.services.news_service import NewsService
+from app.dependencies import get_current_api_key, get_shared_news_service
 from app.utils.exceptions import (
     NewsNotFoundException,
     InvalidCursorException,
+    InvalidDateException,
     news_not_found_exception,
     invalid_cursor_exception
 )
+from app.utils.dates import parse_iso
 from app.utils.logger import log_info, log_error
+from app.utils.response import response_metadata
+from app.utils.timestamps import utc_now_iso
 
 
 router = APIRouter(prefix="/news", tags=["News"])
 
+# News list pages with more items than this are streamed
+_STREAM_MIN_ITEMS = 200
+_STREAM_CHUNK_ITEMS = 50
+
+
+def _list_item(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a news document like NewsListItem, without pydantic validation.
+    
+    Args:
+        doc: News document from the list query
+    
+    Returns:
+        dict: NewsListItem fields, in schema order
+    """
+    return {
+        "slug": doc.get("slug"),
+        "title": doc.get("title"),
+        "subtitle": doc.get("subtitle"),
+        "source": doc.get("source"),
+        "sourceName": doc.get("sourceName"),
+        "sourceUrl": doc.get("sourceUrl"),
+        "releasedAt": doc.get("releasedAt"),
+        "assets": [
+            {
+                "name": asset.get("name"),
+                "slug": asset.get("slug"),
+                "symbol": asset.get("symbol"),
+            }
+            for asset in doc.get("assets") or ()
+        ],
+    }
+
+
+def _detail_item(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a news document like NewsDetail, without pydantic validation.
+    
+    Args:
+        doc: News document from the detail query
+    
+    Returns:
+        dict: NewsDetail fields, in schema order
+    """
+    item = _list_item(doc)
+    return {
+        "slug": item["slug"],
+        "title": item["title"],
+        "subtitle": item["subtitle"],
+        "content": doc.get("content"),
+        "source": item["source"],
+        "sourceName": item["sourceName"],
+        "sourceUrl": item["sourceUrl"],
+        "releasedAt": item["releasedAt"],
+        "assets": item["assets"],
+        "createdAt": doc.get("createdAt"),
+        "updatedAt": doc.get("updatedAt"),
+    }
+
+
+async def _stream_list_body(
+    news_list: List[Dict[str, Any]],
+    pagination: Dict[str, Any],
+    metadata: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """
+    Yield a NewsListResponse JSON body in chunks of _STREAM_CHUNK_ITEMS items.
+    
+    Args:
+        news_list: News documents for the page
+        pagination: Pagination metadata
+        metadata: Response metadata
+    
+    Yields:
+        bytes: Consecutive pieces of the JSON body
+    """
+    yield b'{"success":true,"data":['
+    for i in range(0, len(news_list), _STREAM_CHUNK_ITEMS):
+        chunk = b",".join(
+            orjson.dumps(_list_item(item), option=orjson.OPT_UTC_Z)
+            for item in news_list[i:i + _STREAM_CHUNK_ITEMS]
+        )
+        yield chunk if i == 0 else b"," + chunk
+    yield (
+        b'],"pagination":' + orjson.dumps(pagination)
+        + b',"metadata":' + orjson.dumps(metadata) + b"}"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _build_query_params(**params) -> NewsQueryParams:
+    """
+    Build validated query parameters, reusing instances for repeated queries.
+    
+    A small set of filter combinations dominates traffic, so validated
+    (frozen) models are cached by their inputs. Validation errors are
+    raised, not cached, and a date accepted once stays in the past.
+    
+    Args:
+        **params: NewsQueryParams field values
+    
+    Returns:
+        NewsQueryParams: Validated query parameters
+    """
+    return NewsQueryParams(**params)
+
 
 @router.get(
     "",
@@ -45,9 +156,12 @@ async def get_news_list(
     keyword: Annotated[str | None, Query(description="Search keyword", min_length=2, max_length=100)] = None,
     limit: Annotated[int, Query(description="Number of items per page", ge=10, le=1000)] = 100,
     cursor: Annotated[str | None, Query(description="Pagination cursor")] = None,
-    sort_by: Annotated[str, Query(description="Sort field")] = "releasedAt",
-    order: Annotated[str, Query(description="Sort order (asc/desc)")] = "desc",
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    sort_by: Annotated[
+        Literal["releasedAt", "title", "createdAt"],
+        Query(description="Sort field")
+    ] = "releasedAt",
+    order: Annotated[Literal["asc", "desc"], Query(description="Sort order (asc/desc)")] = "desc",
+    news_service: NewsService = Depends(get_shared_news_service),
     api_key: str = Depends(get_current_api_key),
 ):
     """
@@ -69,7 +183,7 @@ async def get_news_list(
     - `order`: Sort order (asc, desc)
     """
     # Start timer for query performance
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
         # Parse query parameters
@@ -82,12 +196,8 @@ async def get_news_list(
         
         if start:
             try:
-                # Handle different date formats
-                if 'Z' in start:
-                    params_dict["start"] = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                else:
-                    params_dict["start"] = datetime.fromisoformat(start)
-            except ValueError as e:
+                params_dict["start"] = parse_iso(start)
+            except InvalidDateException as e:
                 log_error("Invalid start format", error=str(e), start=start)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,19 +207,15 @@ async def get_news_list(
                             "code": "INVALID_DATE_FORMAT",
                             "message": f"Invalid start format. Use ISO 8601 format (e.g., 2025-11-20 or 2025-11-20T10:30:00Z)",
                             "status": 400,
-                            "timestamp": datetime.utcnow().isoformat() + "Z"
+                            "timestamp": utc_now_iso()
                         }
                     }
                 )
         
         if end:
             try:
-                # Handle different date formats
-                if 'Z' in end:
-                    params_dict["end"] = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                else:
-                    params_dict["end"] = datetime.fromisoformat(end)
-            except ValueError as e:
+                params_dict["end"] = parse_iso(end)
+            except InvalidDateException as e:
                 log_error("Invalid end format", error=str(e), end=end)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -119,7 +225,7 @@ async def get_news_list(
                             "code": "INVALID_DATE_FORMAT",
                             "message": f"Invalid end format. Use ISO 8601 format (e.g., 2025-11-20 or 2025-11-20T10:30:00Z)",
                             "status": 400,
-                            "timestamp": datetime.utcnow().isoformat() + "Z"
+                            "timestamp": utc_now_iso()
                         }
                     }
                 )
@@ -131,16 +237,12 @@ async def get_news_list(
         if keyword:
             params_dict["keyword"] = keyword
         
-        params = NewsQueryParams(**params_dict)
-        
-        # Get news service
-        news_service = NewsService(db)
+        params = _build_query_params(**params_dict)
         
         # Fetch news
         news_list, pagination = await news_service.get_news_list(params)
         
-        # Calculate query time
-        query_time_ms = (time.time() - start_time) * 1000
+        metadata = response_metadata(start_time)
         
         # Log request
         log_info(
@@ -148,18 +250,27 @@ async def get_news_list(
             count=len(news_list),
             source=source,
             has_cursor=bool(cursor),
-            query_time_ms=round(query_time_ms, 2)
+            query_time_ms=metadata["query_time_ms"]
         )
         
-        return NewsListResponse(
-            success=True,
-            data=[NewsListItem(**item) for item in news_list],
-            pagination=pagination,
-            metadata=ResponseMetadata(
-                query_time_ms=round(query_time_ms, 2),
-                timestamp=datetime.utcnow().isoformat(),
-                api_version="1.0.0"
+        # Large pages are streamed in chunks rather than built as one buffer
+        if len(news_list) > _STREAM_MIN_ITEMS:
+            return StreamingResponse(
+                _stream_list_body(news_list, pagination, metadata),
+                media_type="application/json"
             )
+        
+        # Serialize the NewsListResponse shape in one orjson call instead of
+        # validating a model per item (response_model still documents it)
+        body = {
+            "success": True,
+            "data": [_list_item(item) for item in news_list],
+            "pagination": pagination,
+            "metadata": metadata
+        }
+        return Response(
+            content=orjson.dumps(body, option=orjson.OPT_UTC_Z),
+            media_type="application/json"
         )
     
     except InvalidCursorException as e:
@@ -188,7 +299,7 @@ async def get_news_list(
 )
 async def get_news_by_slug(
     slug: Annotated[str, Path(description="News article slug")],
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    news_service: NewsService = Depends(get_shared_news_service),
     api_key: str = Depends(get_current_api_key),
 ):
     """
@@ -201,29 +312,27 @@ async def get_news_by_slug(
     - Full news article including content, metadata, and related assets
     """
     # Start timer for query performance
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
-        # Get news service
-        news_service = NewsService(db)
-        
         # Fetch news
         news = await news_service.get_news_by_slug(slug)
         
-        # Calculate query time
-        query_time_ms = (time.time() - start_time) * 1000
+        metadata = response_metadata(start_time)
         
         # Log request
-        log_info("News detail fetched", slug=slug, query_time_ms=round(query_time_ms, 2))
+        log_info("News detail fetched", slug=slug, query_time_ms=metadata["query_time_ms"])
         
-        return NewsDetailResponse(
-            success=True,
-            data=NewsDetail(**news),
-            metadata=ResponseMetadata(
-                query_time_ms=round(query_time_ms, 2),
-                timestamp=datetime.utcnow().isoformat(),
-                api_version="1.0.0"
-            )
+        # Serialize the NewsDetailResponse shape directly instead of
+        # validating the document (response_model still documents it)
+        body = {
+            "success": True,
+            "data": _detail_item(news),
+            "metadata": metadata
+        }
+        return Response(
+            content=orjson.dumps(body, option=orjson.OPT_UTC_Z),
+            media_type="application/json"
         )
     
     except NewsNotFoundException:
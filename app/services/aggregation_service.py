@@ -3,37 +3,149 @@ Aggregation service for news analytics and statistics.
 Provides aggregated data for reporting and dashboards.
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+import hashlib
+import inspect
+import time
+from contextvars import ContextVar
+from functools import cached_property, wraps
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
+import orjson
 
 from app.config import settings
 from app.utils.logger import log_info
 
 
+# Recent aggregation results: (method, collection, args) -> (expires_at, results, etag)
+_result_cache: Dict[tuple, Tuple[float, Any, str]] = {}
+_RESULT_CACHE_MAX_ENTRIES = 1024
+
+# Keys whose pipeline is currently running, so concurrent misses wait for it
+_pending_locks: Dict[tuple, asyncio.Lock] = {}
+
+# Ranges ending this long ago no longer receive news and are cached for
+# AGGREGATION_CACHE_CLOSED_RANGE_TTL
+_CLOSED_RANGE_MARGIN = timedelta(days=1)
+
+# Documents per cursor batch for pipelines returning many rows; MongoDB's
+# default first batch (101) would cost a getMore for e.g. a yearly timeline
+_AGGREGATE_BATCH_SIZE = 1000
+
+# (etag, expires_at) of the cached result last returned in this context,
+# for HTTP validation; None if the result did not come from the cache
+cached_result_entry: ContextVar[Optional[Tuple[str, float]]] = ContextVar(
+    "cached_result_entry", default=None
+)
+
+
+def clear_result_cache() -> None:
+    """Drop all cached aggregation results (e.g. after new news is ingested)."""
+    _result_cache.clear()
+
+
+def _result_etag(key: tuple, results: Any) -> str:
+    """Build a weak ETag from a cache key and the content of its result."""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8)
+    digest.update(orjson.dumps(results, default=str))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _is_closed_range(end: Optional[datetime]) -> bool:
+    """Return True if end lies more than _CLOSED_RANGE_MARGIN in the past."""
+    if end is None:
+        return False
+    now = datetime.now(timezone.utc)
+    if end.tzinfo is None:
+        # Naive query dates are UTC, as MongoDB stores them
+        now = now.replace(tzinfo=None)
+    return end < now - _CLOSED_RANGE_MARGIN
+
+
+def _cached_results(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Cache an aggregation method's results for AGGREGATION_CACHE_TTL seconds.
+    
+    Aggregations change slowly, so repeated dashboard queries with the same
+    arguments reuse the last result instead of re-running the pipeline.
+    Results for closed date ranges (``end`` well in the past) are kept for
+    AGGREGATION_CACHE_CLOSED_RANGE_TTL instead, if that is longer.
+    Concurrent misses for the same key run the pipeline once; the others
+    wait and read the cached result.
+    Each entry carries an ETag of its content; returning a cached result
+    publishes ``(etag, expires_at)`` in ``cached_result_entry``.
+    Cached results are shared between requests and must not be mutated.
+    """
+    signature = inspect.signature(method)
+    
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        ttl = settings.AGGREGATION_CACHE_TTL
+        if ttl <= 0:
+            return await method(self, *args, **kwargs)
+        
+        key = (method.__name__, settings.MONGODB_COLLECTION_NAME, args, tuple(sorted(kwargs.items())))
+        cached = _result_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            cached_result_entry.set((cached[2], cached[0]))
+            return cached[1]
+        
+        lock = _pending_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have filled the entry while we waited
+            cached = _result_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                cached_result_entry.set((cached[2], cached[0]))
+                return cached[1]
+            
+            try:
+                results = await method(self, *args, **kwargs)
+            finally:
+                # Later arrivals find the cached entry and need no lock
+                if _pending_locks.get(key) is lock:
+                    del _pending_locks[key]
+            
+            end = signature.bind(self, *args, **kwargs).arguments.get("end")
+            if _is_closed_range(end):
+                ttl = max(ttl, settings.AGGREGATION_CACHE_CLOSED_RANGE_TTL)
+            
+            # Re-insert so the dict stays ordered by insertion time, oldest first
+            _result_cache.pop(key, None)
+            if len(_result_cache) >= _RESULT_CACHE_MAX_ENTRIES:
+                del _result_cache[next(iter(_result_cache))]
+            expires_at = time.monotonic() + ttl
+            etag = _result_etag(key, results)
+            _result_cache[key] = (expires_at, results, etag)
+            cached_result_entry.set((etag, expires_at))
+            return results
+    
+    return wrapper
+
+
 class AggregationService:
     """Service for news aggregation and analytics."""
     
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
-        self.collection = db[settings.MONGODB_COLLECTION_NAME]
     
-    async def get_stats_by_source(
-        self,
+    @cached_property
+    def collection(self):
+        """News collection, looked up on first use."""
+        return self.db[settings.MONGODB_COLLECTION_NAME]
+    
+    @staticmethod
+    def _match_stages(
         start: Optional[datetime] = None,
-        end: Optional[datetime] = None
+        end: Optional[datetime] = None,
+        source: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get news count grouped by source.
-        
-        Args:
-            start: Start date filter
-            end: End date filter
+        Build the optional $match stage for date range and source filters.
         
         Returns:
-            List of source statistics
+            list: [] or a single $match stage
         """
-        # Build match stage
         match_stage = {}
         if start or end:
             date_filter = {}
@@ -42,81 +154,92 @@ class AggregationService:
             if end:
                 date_filter["$lte"] = end
             match_stage["releasedAt"] = date_filter
-        
-        # Aggregation pipeline
-        pipeline = []
-        
-        if match_stage:
-            pipeline.append({"$match": match_stage})
-        
-        pipeline.extend([
+        if source:
+            match_stage["source"] = source
+        return [{"$match": match_stage}] if match_stage else []
+    
+    # Pipeline stage templates, built once and shared by every pipeline.
+    # Stages are only read by the driver, never mutated.
+    _SOURCE_COUNT_STAGES: List[Dict[str, Any]] = [
+        {
+            "$group": {
+                "_id": "$source",
+                "count": {"$sum": 1}
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "source": "$_id",
+                "count": 1
+            }
+        },
+        {"$sort": {"count": -1}}
+    ]
+    
+    _TIMELINE_STAGES: Dict[str, List[Dict[str, Any]]] = {
+        interval: [
             {
                 "$group": {
-                    "_id": "$source",
+                    "_id": {
+                        "$dateToString": {
+                            "format": date_format,
+                            "date": "$releasedAt"
+                        }
+                    },
                     "count": {"$sum": 1}
                 }
             },
             {
                 "$project": {
                     "_id": 0,
-                    "source": "$_id",
+                    "date": "$_id",
                     "count": 1
                 }
             },
-            {"$sort": {"count": -1}}
-        ])
-        
-        # Execute aggregation
-        cursor = self.collection.aggregate(pipeline)
-        results = await cursor.to_list(length=None)
-        
-        log_info("Stats by source fetched", count=len(results))
-        
-        return results
+            {"$sort": {"date": 1}}
+        ]
+        for interval, date_format in (
+            ("daily", "%Y-%m-%d"),
+            ("weekly", "%Y-W%U"),  # Year-Week
+            ("monthly", "%Y-%m")
+        )
+    }
     
-    async def get_top_assets(
-        self,
-        limit: int = 10,
-        start: Optional[datetime] = None,
-        end: Optional[datetime] = None,
-        source: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Get most mentioned assets.
-        
-        Args:
-            limit: Number of top assets to return
-            start: Start date filter
-            end: End date filter
-            source: Filter by specific source
-        
-        Returns:
-            List of top assets with counts
-        """
-        # Build match stage
-        match_stage = {}
-        
-        if start or end:
-            date_filter = {}
-            if start:
-                date_filter["$gte"] = start
-            if end:
-                date_filter["$lte"] = end
-            match_stage["releasedAt"] = date_filter
-        
-        if source:
-            match_stage["source"] = source
-        
-        # Aggregation pipeline
-        pipeline = []
-        
-        if match_stage:
-            pipeline.append({"$match": match_stage})
-        
-        pipeline.extend([
+    # Bucket stages for each get_stats group_by value
+    _STATS_BUCKET_STAGES: Dict[str, List[Dict[str, Any]]] = {
+        "source": _SOURCE_COUNT_STAGES,
+        "date": _TIMELINE_STAGES["daily"]
+    }
+    
+    _SOURCE_PERFORMANCE_STAGES: List[Dict[str, Any]] = [
+        {
+            "$group": {
+                "_id": "$source",
+                "total_news": {"$sum": 1}
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "source": "$_id",
+                "total_news": 1
+            }
+        },
+        {"$sort": {"total_news": -1}}
+    ]
+    
+    @staticmethod
+    def _top_assets_stages(limit: int) -> List[Dict[str, Any]]:
+        """Build stages ranking the most mentioned assets."""
+        return [
+            # Drop news without any slugged asset before unwinding
+            {"$match": {"assets.slug": {"$exists": True}}},
+            # Keep only the asset fields, so unwinding copies small documents
+            {"$project": {"_id": 0, "assets.slug": 1, "assets.name": 1, "assets.symbol": 1}},
             # Unwind assets array
             {"$unwind": "$assets"},
-            # Filter out assets without slug
+            # Filter out the remaining assets without slug (or a null one)
             {"$match": {"assets.slug": {"$exists": True, "$ne": None}}},
             # Group by asset
             {
@@ -143,30 +266,174 @@ class AggregationService:
                     "count": 1
                 }
             }
-        ])
+        ]
+    
+    @staticmethod
+    def _percentage_stage(assets_field: str, total_path: str) -> Dict[str, Any]:
+        """
+        Build a $set stage adding each asset's share of the total, in percent.
         
-        # Execute aggregation
+        Runs after a $facet: assets_field is the branch holding the ranked
+        assets and total_path the $count value (e.g. "total.count").
+        """
+        total = {"$ifNull": [{"$arrayElemAt": [f"${total_path}", 0]}, 1]}
+        return {
+            "$set": {
+                assets_field: {
+                    "$map": {
+                        "input": f"${assets_field}",
+                        "as": "asset",
+                        "in": {
+                            "$mergeObjects": [
+                                "$$asset",
+                                {"percentage": {"$round": [
+                                    {"$multiply": [{"$divide": ["$$asset.count", total]}, 100]},
+                                    2
+                                ]}}
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+    
+    @staticmethod
+    def _add_avg_per_day(
+        sources: List[Dict[str, Any]],
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> None:
+        """Set each source's average news per day when a date range is given."""
+        if start and end:
+            days = (end - start).days + 1
+            for item in sources:
+                item["avg_per_day"] = round(item["total_news"] / days, 2) if days > 0 else 0
+    
+    @classmethod
+    def _source_count_stages(cls) -> List[Dict[str, Any]]:
+        """Stages counting news per source, most frequent first."""
+        return cls._SOURCE_COUNT_STAGES
+    
+    @classmethod
+    def _timeline_stages(cls, interval: str) -> List[Dict[str, Any]]:
+        """Stages counting news per time period, oldest first."""
+        return cls._TIMELINE_STAGES.get(interval, cls._TIMELINE_STAGES["daily"])
+    
+    @_cached_results
+    async def get_stats(
+        self,
+        group_by: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Get news counts grouped by source or day, with the overall total.
+        
+        Both come from one $facet pass: the buckets, and a $count of the
+        matched documents (equal to the sum of the bucket counts).
+        
+        Args:
+            group_by: "source" or "date"
+            start: Start date filter
+            end: End date filter
+        
+        Returns:
+            dict: {"buckets": [...], "total": int}
+        """
+        pipeline = self._match_stages(start, end) + [
+            {
+                "$facet": {
+                    "buckets": self._STATS_BUCKET_STAGES[group_by],
+                    "total": [{"$count": "count"}]
+                }
+            }
+        ]
+        
+        # Execute aggregation ($facet always yields exactly one document)
         cursor = self.collection.aggregate(pipeline)
-        results = await cursor.to_list(length=limit)
+        results = await cursor.to_list(length=None)
+        facet = results[0] if results else {}
+        
+        buckets = facet.get("buckets", [])
+        total_rows = facet.get("total")
+        total = total_rows[0]["count"] if total_rows else 0
+        
+        log_info("Stats fetched", group_by=group_by, count=len(buckets), total=total)
+        
+        return {"buckets": buckets, "total": total}
+    
+    @_cached_results
+    async def get_stats_by_source(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get news count grouped by source.
         
-        # Calculate total for percentages
-        total_pipeline = []
-        if match_stage:
-            total_pipeline.append({"$match": match_stage})
-        total_pipeline.append({"$count": "total"})
+        Args:
+            start: Start date filter
+            end: End date filter
+        
+        Returns:
+            List of source statistics
+        """
+        pipeline = self._match_stages(start, end) + self._source_count_stages()
+        
+        # Execute aggregation
+        cursor = self.collection.aggregate(pipeline, batchSize=_AGGREGATE_BATCH_SIZE)
+        results = await cursor.to_list(length=None)
+        
+        log_info("Stats by source fetched", count=len(results))
+        
+        return results
+    
+    @_cached_results
+    async def get_top_assets(
+        self,
+        limit: int = 10,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get most mentioned assets.
         
-        total_cursor = self.collection.aggregate(total_pipeline)
-        total_results = await total_cursor.to_list(length=1)
-        total_news = total_results[0]["total"] if total_results else 0
+        The ranking and the matched total come from one $facet pass over
+        the $match result; percentages are computed on the server.
         
-        # Add percentages
-        for item in results:
-            item["percentage"] = round((item["count"] / total_news * 100), 2) if total_news > 0 else 0
+        Args:
+            limit: Number of top assets to return
+            start: Start date filter
+            end: End date filter
+            source: Filter by specific source
+        
+        Returns:
+            List of top assets with counts
+        """
+        pipeline = self._match_stages(start, end, source) + [
+            {
+                "$facet": {
+                    "top": self._top_assets_stages(limit),
+                    "total": [{"$count": "total"}]
+                }
+            },
+            self._percentage_stage("top", "total.total")
+        ]
+        
+        # $facet always yields exactly one document
+        facet_results = await self.collection.aggregate(pipeline).to_list(length=1)
+        facet = facet_results[0] if facet_results else {}
+        
+        results = facet.get("top", [])
+        total_rows = facet.get("total")
+        total_news = total_rows[0]["total"] if total_rows else 0
         
         log_info("Top assets fetched", count=len(results), total_news=total_news)
         
         return results
     
+    @_cached_results
     async def get_timeline(
         self,
         interval: str = "daily",
@@ -186,63 +453,41 @@ class AggregationService:
         Returns:
             List of time periods with counts
         """
-        # Build match stage
-        match_stage = {}
-        
-        if start or end:
-            date_filter = {}
-            if start:
-                date_filter["$gte"] = start
-            if end:
-                date_filter["$lte"] = end
-            match_stage["releasedAt"] = date_filter
-        
-        if source:
-            match_stage["source"] = source
-        
-        # Determine date format based on interval
-        date_format = {
-            "daily": "%Y-%m-%d",
-            "weekly": "%Y-W%U",  # Year-Week
-            "monthly": "%Y-%m"
-        }.get(interval, "%Y-%m-%d")
-        
-        # Aggregation pipeline
-        pipeline = []
-        
-        if match_stage:
-            pipeline.append({"$match": match_stage})
-        
-        pipeline.extend([
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": date_format,
-                            "date": "$releasedAt"
-                        }
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "date": "$_id",
-                    "count": 1
-                }
-            },
-            {"$sort": {"date": 1}}
-        ])
+        pipeline = self._match_stages(start, end, source) + self._timeline_stages(interval)
         
         # Execute aggregation
-        cursor = self.collection.aggregate(pipeline)
+        cursor = self.collection.aggregate(pipeline, batchSize=_AGGREGATE_BATCH_SIZE)
         results = await cursor.to_list(length=None)
         
         log_info("Timeline fetched", interval=interval, count=len(results))
         
         return results
     
+    async def stream_timeline(
+        self,
+        interval: str = "daily",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the get_timeline periods as they come off the cursor.
+        
+        Long date ranges are never buffered as a list; results bypass the
+        result cache.
+        
+        Args:
+            interval: Time interval (daily, weekly, monthly)
+            start: Start date
+            end: End date
+            source: Filter by source
+        """
+        pipeline = self._match_stages(start, end, source) + self._timeline_stages(interval)
+        
+        async for period in self.collection.aggregate(pipeline, batchSize=_AGGREGATE_BATCH_SIZE):
+            yield period
+    
+    @_cached_results
     async def get_source_performance(
         self,
         start: Optional[datetime] = None,
@@ -258,54 +503,76 @@ class AggregationService:
         Returns:
             List of source performance statistics
         """
-        # Build match stage
-        match_stage = {}
-        if start or end:
-            date_filter = {}
-            if start:
-                date_filter["$gte"] = start
-            if end:
-                date_filter["$lte"] = end
-            match_stage["releasedAt"] = date_filter
+        pipeline = self._match_stages(start, end) + self._SOURCE_PERFORMANCE_STAGES
         
-        # Aggregation pipeline
-        pipeline = []
+        # Execute aggregation
+        cursor = self.collection.aggregate(pipeline, batchSize=_AGGREGATE_BATCH_SIZE)
+        results = await cursor.to_list(length=None)
         
-        if match_stage:
-            pipeline.append({"$match": match_stage})
+        self._add_avg_per_day(results, start, end)
         
-        pipeline.extend([
-            {
-                "$group": {
-                    "_id": "$source",
-                    "total_news": {"$sum": 1},
-                    "assets": {"$push": "$assets"}
-                }
-            },
+        log_info("Source performance fetched", sources=len(results))
+        
+        return results
+    
+    @_cached_results
+    async def get_dashboard(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source: Optional[str] = None,
+        top_n: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Get all dashboard aggregations in a single pipeline.
+        
+        One $match feeds a $facet with a branch per aggregation, so a
+        dashboard needs one round trip and one scan instead of four.
+        
+        Args:
+            start: Start date filter
+            end: End date filter
+            source: Filter by source
+            top_n: Number of top assets to return
+        
+        Returns:
+            dict: {"by_source", "timeline", "top_assets",
+            "source_performance"} result lists and the matched "total"
+        """
+        pipeline = self._match_stages(start, end, source) + [
             {
-                "$project": {
-                    "_id": 0,
-                    "source": "$_id",
-                    "total_news": 1,
-                    "assets": 1
+                "$facet": {
+                    "by_source": self._SOURCE_COUNT_STAGES,
+                    "timeline": self._TIMELINE_STAGES["daily"],
+                    "top_assets": self._top_assets_stages(top_n),
+                    "source_performance": self._SOURCE_PERFORMANCE_STAGES,
+                    "total": [{"$count": "count"}]
                 }
             },
-            {"$sort": {"total_news": -1}}
-        ])
+            self._percentage_stage("top_assets", "total.count")
+        ]
         
-        # Execute aggregation
+        # Execute aggregation ($facet always yields exactly one document)
         cursor = self.collection.aggregate(pipeline)
         results = await cursor.to_list(length=None)
+        facet = results[0] if results else {}
         
-        # Calculate days if date range provided
-        if start and end:
-            days = (end - start).days + 1
-            for item in results:
-                item["avg_per_day"] = round(item["total_news"] / days, 2) if days > 0 else 0
+        total_rows = facet.get("total")
+        total = total_rows[0]["count"] if total_rows else 0
         
-        log_info("Source performance fetched", sources=len(results))
+        top_assets = facet.get("top_assets", [])
+        source_performance = facet.get("source_performance", [])
+        self._add_avg_per_day(source_performance, start, end)
         
-        return results
+        log_info("Dashboard fetched", total=total)
+        
+        return {
+            "by_source": facet.get("by_source", []),
+            "timeline": facet.get("timeline", []),
+            "top_assets": top_assets,
+            "source_performance": source_performance,
+            "total": total
+        }
 
 
 async def get_aggregation_service(db: AsyncIOMotorDatabase) -> AggregationService:
@@ -3,25 +3,38 @@ News service containing business logic for news operations.
 Handles database queries, filtering, sorting, and pagination.
 """
 
+from functools import cached_property
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 
 from app.models.news import NewsListItem, NewsDetail
-from app.models.request import NewsQueryParams
+from app.models.request import NewsQueryParams, SortField
 from app.services.cursor_service import cursor_service
 from app.core.pagination import create_pagination_response
 from app.utils.exceptions import NewsNotFoundException
 from app.config import settings
 
 
+# List queries fetch only what NewsListItem renders, plus every sortable
+# field (pagination cursors read the sort value) and _id
+_LIST_PROJECTION = {
+    **{field: 1 for field in NewsListItem.model_fields},
+    **{field.value: 1 for field in SortField},
+}
+
+
 class NewsService:
     """Service for news-related operations."""
     
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
-        self.collection = db[settings.MONGODB_COLLECTION_NAME]
+    
+    @cached_property
+    def collection(self):
+        """News collection, looked up on first use."""
+        return self.db[settings.MONGODB_COLLECTION_NAME]
     
     async def get_news_list(
         self,
@@ -61,12 +74,8 @@ class NewsService:
         # Fetch results - await is here
         items = await cursor.to_list(length=params.limit + 1)
         
-        # Convert ObjectId to string
-        for item in items:
-            if "_id" in item:
-                item["_id"] = str(item["_id"])
-        
-        # Create pagination response
+        # Create pagination response while _id is still a raw ObjectId,
+        # so cursors pack its 12 bytes directly
         pagination = create_pagination_response(
             items,
             params.limit,
@@ -77,6 +86,11 @@ class NewsService:
         # Return actual items (without the +1 extra)
         actual_items = items[:params.limit]
         
+        # Convert ObjectId to string
+        for item in actual_items:
+            if "_id" in item:
+                item["_id"] = str(item["_id"])
+        
         return actual_items, pagination
     
     async def get_news_by_slug(self, slug: str) -> Dict[str, Any]:
@@ -136,15 +150,11 @@ class NewsService:
         if params.asset_slug:
             query["assets.slug"] = params.asset_slug
         
-        # Keyword search (text search in title and content)
+        # Keyword search (text search in title, subtitle and content)
         if params.keyword:
-            # Use regex for flexible search
-            keyword_regex = {"$regex": params.keyword, "$options": "i"}
-            query["$or"] = [
-                {"title": keyword_regex},
-                {"content": keyword_regex},
-                {"subtitle": keyword_regex}
-            ]
+            # Served by the text index instead of a regex collection scan;
+            # results keep the requested sort so cursors stay valid
+            query["$text"] = {"$search": params.keyword}
         
         return query
     
@@ -169,16 +179,14 @@ class NewsService:
     
     def _get_list_projection(self) -> Dict[str, int]:
         """
-        Get projection for list queries (excludes full content).
+        Get projection for list queries (NewsListItem fields only).
         
         Returns:
             dict: MongoDB projection
         """
-        # MongoDB projection: use only inclusion OR only exclusion, not both
-        # For list view, we exclude only the content field
-        return {
-            "content": 0  # Exclude only content field (exclusion projection)
-        }
+        # Inclusion projection, so large fields added to documents later
+        # (not just content) stay off the wire
+        return _LIST_PROJECTION
     
     def _get_detail_projection(self) -> Dict[str, int]:
         """
@@ -4,6 +4,7 @@ from app.utils.exceptions import (
     NewsAPIException,
     NewsNotFoundException,
     InvalidCursorException,
+    InvalidDateException,
     DatabaseConnectionException,
     RateLimitExceededException,
     create_http_exception,
@@ -12,11 +13,15 @@ from app.utils.exceptions import (
     rate_limit_exception,
 )
 from app.utils.logger import logger, log_info, log_error, log_warning, log_debug
+from app.utils.timestamps import utc_now_iso
+from app.utils.dates import parse_iso
+from app.utils.response import response_metadata
 
 __all__ = [
     "NewsAPIException",
     "NewsNotFoundException",
     "InvalidCursorException",
+    "InvalidDateException",
     "DatabaseConnectionException",
     "RateLimitExceededException",
     "create_http_exception",
@@ -28,4 +33,7 @@ __all__ = [
     "log_error",
     "log_warning",
     "log_debug",
+    "utc_now_iso",
+    "parse_iso",
+    "response_metadata",
 ]
@@ -0,0 +1,55 @@
+"""
+Date parsing helpers.
+Fast ISO 8601 parsing for query parameters.
+"""
+
+import sys
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from app.utils.exceptions import InvalidDateException
+
+try:
+    # Optional C parser, faster than datetime.fromisoformat()
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:  # pragma: no cover - depends on installed extras
+    _parse_datetime = None
+
+
+# datetime.fromisoformat() accepts a trailing "Z" natively from Python 3.11
+_ISO_Z_OK = sys.version_info >= (3, 11)
+
+
+@lru_cache(maxsize=4096)
+def parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 date or datetime string.
+    
+    Accepts a trailing "Z" for UTC. Uses ciso8601 when it is installed;
+    otherwise, on Python 3.11+ the string goes straight to
+    datetime.fromisoformat() (a single C call) and older versions only
+    rewrite the suffix when it is present.
+    
+    Dashboards poll the same date windows over and over, so results are
+    memoized; datetimes are immutable and safe to share.
+    
+    Args:
+        value: ISO 8601 string (e.g. "2025-11-20" or "2025-11-20T10:30:00Z")
+    
+    Returns:
+        datetime: Parsed datetime, or None if value is empty
+    
+    Raises:
+        InvalidDateException: If value is not valid ISO 8601
+    """
+    if not value:
+        return None
+    try:
+        if _parse_datetime is not None:
+            return _parse_datetime(value)
+        if not _ISO_Z_OK and value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)
+    except ValueError as e:
+        raise InvalidDateException(f"Invalid date format: {value}") from e
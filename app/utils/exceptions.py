@@ -5,6 +5,8 @@ Provides specific error types for better error handling.
 
 from fastapi import HTTPException, status
 
+from app.utils.timestamps import utc_now_iso
+
 
 class NewsAPIException(Exception):
     """Base exception for News API."""
@@ -27,6 +29,14 @@ class InvalidCursorException(NewsAPIException):
         super().__init__(self.message)
 
 
+class InvalidDateException(NewsAPIException, ValueError):
+    """Exception raised when a date query parameter is not valid ISO 8601."""
+    
+    def __init__(self, message: str = "Invalid date format"):
+        self.message = message
+        super().__init__(self.message)
+
+
 class DatabaseConnectionException(NewsAPIException):
     """Exception raised when database connection fails."""
     
@@ -59,8 +69,6 @@ def create_http_exception(
     Returns:
         HTTPException: Formatted exception
     """
-    from datetime import datetime
-    
     return HTTPException(
         status_code=status_code,
         detail={
@@ -68,7 +76,7 @@ def create_http_exception(
                 "code": error_code,
                 "message": message,
                 "status": status_code,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": utc_now_iso()
             }
         }
     )
@@ -3,13 +3,63 @@ Logging configuration.
 Sets up structured logging for the application.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 
 from app.config import settings
 
 
+# Records waiting to be written by the background listener thread
+LOG_QUEUE_SIZE = 10_000
+
+_listener: Optional[QueueListener] = None
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of failing when the queue is full."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record is passed as-is and
+        # message/traceback formatting happens on the listener thread
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Shed log load under overload rather than slow down requests
+            pass
+
+
+def _format(message: str, context: dict) -> str:
+    """Append key=value context to a log message."""
+    if not context:
+        return message
+    return f"{message} | " + " | ".join(f"{k}={v}" for k, v in context.items())
+
+
+class _ContextFormatter(logging.Formatter):
+    """Formatter that appends the record's ``context`` (from ``extra=``) to the message."""
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        context = getattr(record, "context", None)
+        if context:
+            record.message = _format(record.message, context)
+        return super().formatMessage(record)
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logger() -> logging.Logger:
     """
     Setup and configure application logger.
@@ -31,19 +81,27 @@ def setup_logger() -> logging.Logger:
     # Create formatter
     if settings.DEBUG:
         # Detailed format for development
-        formatter = logging.Formatter(
+        formatter = _ContextFormatter(
             fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
     else:
         # JSON-like format for production
-        formatter = logging.Formatter(
+        formatter = _ContextFormatter(
             fmt='{"time":"%(asctime)s","name":"%(name)s","level":"%(levelname)s","message":"%(message)s"}',
             datefmt="%Y-%m-%dT%H:%M:%S"
         )
     
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # Write records from a background thread, so formatting and stdout I/O
+    # stay off the request path; the logger only enqueues
+    global _listener
+    _stop_listener()
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(_DroppingQueueHandler(log_queue))
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -53,31 +111,31 @@ def setup_logger() -> logging.Logger:
 
 # Global logger instance
 logger = setup_logger()
+atexit.register(_stop_listener)
 
 
 def log_info(message: str, **kwargs: Any):
     """Log info message with optional context."""
-    extra_info = " | ".join(f"{k}={v}" for k, v in kwargs.items())
-    full_message = f"{message} | {extra_info}" if extra_info else message
-    logger.info(full_message)
+    # Context travels on the record and is formatted on the listener thread,
+    # and only if the record will be emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(message, extra={"context": kwargs})
 
 
-def log_error(message: str, **kwargs: Any):
-    """Log error message with optional context."""
-    extra_info = " | ".join(f"{k}={v}" for k, v in kwargs.items())
-    full_message = f"{message} | {extra_info}" if extra_info else message
-    logger.error(full_message)
+def log_error(message: str, exc_info: Optional[BaseException] = None, **kwargs: Any):
+    """Log error message with optional context and exception traceback."""
+    if logger.isEnabledFor(logging.ERROR):
+        # The traceback is formatted on the listener thread
+        logger.error(message, exc_info=exc_info, extra={"context": kwargs})
 
 
 def log_warning(message: str, **kwargs: Any):
     """Log warning message with optional context."""
-    extra_info = " | ".join(f"{k}={v}" for k, v in kwargs.items())
-    full_message = f"{message} | {extra_info}" if extra_info else message
-    logger.warning(full_message)
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(message, extra={"context": kwargs})
 
 
 def log_debug(message: str, **kwargs: Any):
     """Log debug message with optional context."""
-    extra_info = " | ".join(f"{k}={v}" for k, v in kwargs.items())
-    full_message = f"{message} | {extra_info}" if extra_info else message
-    logger.debug(full_message)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, extra={"context": kwargs})
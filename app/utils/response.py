@@ -0,0 +1,29 @@
+"""
+Response helpers.
+Shared metadata for API response envelopes.
+"""
+
+import time
+from typing import Any, Dict
+
+from app.utils.timestamps import utc_now_iso
+
+
+API_VERSION = "1.0.0"
+
+
+def response_metadata(start_time: int) -> Dict[str, Any]:
+    """
+    Build the ResponseMetadata payload for a request.
+    
+    Args:
+        start_time: time.perf_counter_ns() value taken when the request started
+    
+    Returns:
+        dict: query_time_ms (rounded to 2 places), timestamp and api_version
+    """
+    return {
+        "query_time_ms": round((time.perf_counter_ns() - start_time) / 1e6, 2),
+        "timestamp": utc_now_iso(),
+        "api_version": API_VERSION
+    }
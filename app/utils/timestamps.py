@@ -0,0 +1,27 @@
+"""
+Timestamp helpers.
+Fast UTC timestamp formatting for response and error payloads.
+"""
+
+import time
+
+
+# [second, formatted string] of the last utc_now_iso() call
+_iso_cache = [-1, ""]
+
+
+def utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string with a "Z" suffix.
+    
+    The string only changes once per second, so it is formatted at most
+    once per second and reused in between.
+    
+    Returns:
+        str: Timestamp such as "2025-02-26T12:30:00Z"
+    """
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _iso_cache[0] = now
+    return _iso_cache[1]
@@ -45,6 +45,8 @@ def mock_settings(monkeypatch, test_api_key):
     monkeypatch.setattr(settings, "RATE_LIMIT_PER_HOUR", 1000)
     monkeypatch.setattr(settings, "MONGODB_DB_NAME", "test_db")
     monkeypatch.setattr(settings, "MONGODB_COLLECTION_NAME", "test_news")
+    monkeypatch.setattr(settings, "AGGREGATION_CACHE_TTL", 0)
+    monkeypatch.setattr(settings, "HEALTH_PING_CACHE_TTL", 0)
     return settings
 
 
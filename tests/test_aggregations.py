@@ -3,9 +3,13 @@ Unit tests for aggregation endpoints.
 Tests statistical and analytical queries.
 """
 
+import asyncio
+import json
 import pytest
 from datetime import datetime, timezone, timedelta
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import aggregation_service
 
 
 def assert_valid_metadata(metadata):
@@ -33,7 +37,10 @@ class TestStatsAggregation:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_aggregation_stats)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": sample_aggregation_stats,
+            "total": [{"count": sum(item["count"] for item in sample_aggregation_stats)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -56,11 +63,10 @@ class TestStatsAggregation:
         assert isinstance(result["data"], list)
         assert len(result["data"]) > 0
         
-        # Check that each item has filters and total
-        for item in result["data"]:
-            assert "filters" in item
-            assert item["filters"]["group_by"] == "source"
-            assert "total" in item
+        # Check top-level filters and total
+        assert "filters" in result
+        assert result["filters"]["group_by"] == "source"
+        assert "total" in result
     
     async def test_stats_by_date(
         self,
@@ -73,7 +79,10 @@ class TestStatsAggregation:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_timeline_data)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": sample_timeline_data,
+            "total": [{"count": sum(item["count"] for item in sample_timeline_data)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -96,9 +105,8 @@ class TestStatsAggregation:
         assert isinstance(result["data"], list)
         
         # Check filters
-        for item in result["data"]:
-            assert "filters" in item
-            assert item["filters"]["group_by"] == "date"
+        assert "filters" in result
+        assert result["filters"]["group_by"] == "date"
     
     async def test_stats_with_date_filter(
         self,
@@ -111,7 +119,10 @@ class TestStatsAggregation:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_aggregation_stats)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": sample_aggregation_stats,
+            "total": [{"count": sum(item["count"] for item in sample_aggregation_stats)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Date range
@@ -133,10 +144,9 @@ class TestStatsAggregation:
         assert "metadata" in result
         assert_valid_metadata(result["metadata"])
         
-        # Check filters in data items
-        for item in result["data"]:
-            assert item["filters"]["start"] == start
-            assert item["filters"]["end"] == end
+        # Check filters
+        assert result["filters"]["start"] == start
+        assert result["filters"]["end"] == end
     
     async def test_stats_without_date_filter(
         self,
@@ -149,7 +159,10 @@ class TestStatsAggregation:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_aggregation_stats)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": sample_aggregation_stats,
+            "total": [{"count": sum(item["count"] for item in sample_aggregation_stats)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -168,22 +181,21 @@ class TestStatsAggregation:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["start"] is None
-            assert item["filters"]["end"] is None
+        assert result["filters"]["start"] is None
+        assert result["filters"]["end"] is None
     
     async def test_stats_invalid_group_by(
         self,
         async_client,
         auth_headers
     ):
-        """Test that invalid group_by returns 400."""
+        """Test that invalid group_by is rejected by validation."""
         response = await async_client.get(
             "/api/v1/aggregations/stats?group_by=invalid",
             headers=auth_headers
         )
         
-        assert response.status_code == 400
+        assert response.status_code == 422
     
     async def test_stats_total_calculation(
         self,
@@ -200,7 +212,10 @@ class TestStatsAggregation:
         ]
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=stats)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": stats,
+            "total": [{"count": sum(item["count"] for item in stats)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -218,9 +233,8 @@ class TestStatsAggregation:
         assert "metadata" in result
         assert_valid_metadata(result["metadata"])
         
-        # Check total in each data item
-        for item in result["data"]:
-            assert item["total"] == 600  # Sum of all counts
+        # Check total
+        assert result["total"] == 600  # Sum of all counts
 
 
 @pytest.mark.unit
@@ -238,7 +252,10 @@ class TestTopAssets:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_top_assets)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "top": sample_top_assets,
+            "total": [{"total": 700}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -260,10 +277,9 @@ class TestTopAssets:
         # Check data
         assert isinstance(result["data"], list)
         
-        # Check filters in data items
-        for item in result["data"]:
-            assert "filters" in item
-            assert item["filters"]["limit"] == 10  # Default limit
+        # Check filters
+        assert "filters" in result
+        assert result["filters"]["limit"] == 10  # Default limit
     
     async def test_get_top_assets_custom_limit(
         self,
@@ -276,7 +292,10 @@ class TestTopAssets:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_top_assets[:5])
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "top": sample_top_assets[:5],
+            "total": [{"total": 700}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -295,8 +314,7 @@ class TestTopAssets:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["limit"] == 5
+        assert result["filters"]["limit"] == 5
     
     async def test_get_top_assets_with_source_filter(
         self,
@@ -309,7 +327,10 @@ class TestTopAssets:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_top_assets)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "top": sample_top_assets,
+            "total": [{"total": 700}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -328,8 +349,7 @@ class TestTopAssets:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["source"] == "bloomberg"
+        assert result["filters"]["source"] == "bloomberg"
     
     async def test_get_top_assets_with_date_range(
         self,
@@ -342,7 +362,10 @@ class TestTopAssets:
         # Setup mock
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_top_assets)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "top": sample_top_assets,
+            "total": [{"total": 700}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Date range
@@ -365,9 +388,8 @@ class TestTopAssets:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["start"] == start
-            assert item["filters"]["end"] == end
+        assert result["filters"]["start"] == start
+        assert result["filters"]["end"] == end
     
     async def test_get_top_assets_percentage_calculation(
         self,
@@ -375,15 +397,18 @@ class TestTopAssets:
         auth_headers,
         mock_database_manager
     ):
-        """Test that percentages are calculated correctly."""
-        # Setup mock with known values
+        """Test that percentages are computed in the pipeline and passed through."""
+        # Setup mock with known values (percentages as set by the $set stage)
         assets = [
-            {"_id": "bitcoin", "name": "Bitcoin", "symbol": "BTC", "count": 100, "percentage": 50.0},
-            {"_id": "ethereum", "name": "Ethereum", "symbol": "ETH", "count": 100, "percentage": 50.0}
+            {"_id": "bitcoin", "name": "Bitcoin", "symbol": "BTC", "count": 100, "percentage": 25.0},
+            {"_id": "ethereum", "name": "Ethereum", "symbol": "ETH", "count": 100, "percentage": 25.0}
         ]
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=assets)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "top": assets,
+            "total": [{"total": 400}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Make request
@@ -400,6 +425,11 @@ class TestTopAssets:
         assert result["success"] == True
         assert "metadata" in result
         assert_valid_metadata(result["metadata"])
+        
+        # Percentages are each asset's share of the matched total
+        assert [item["percentage"] for item in result["data"]] == [25.0, 25.0]
+        pipeline = mock_collection.aggregate.call_args[0][0]
+        assert "top" in pipeline[-1]["$set"]
 
 
 @pytest.mark.unit
@@ -437,9 +467,37 @@ class TestTimeline:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert "filters" in item
-            assert item["filters"]["interval"] == "daily"
+        assert "filters" in result
+        assert result["filters"]["interval"] == "daily"
+    
+    async def test_timeline_ndjson_stream(
+        self,
+        async_client,
+        auth_headers,
+        mock_database_manager,
+        sample_timeline_data
+    ):
+        """Test that format=ndjson streams one JSON line per period."""
+        class MockStreamCursor:
+            def __aiter__(self):
+                return self._iter()
+            
+            async def _iter(self):
+                for period in sample_timeline_data:
+                    yield period
+        
+        mock_collection = mock_database_manager["collection"]
+        mock_collection.aggregate.return_value = MockStreamCursor()
+        
+        response = await async_client.get(
+            "/api/v1/aggregations/timeline?interval=daily&format=ndjson",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line) for line in lines] == sample_timeline_data
     
     async def test_timeline_weekly(
         self,
@@ -471,8 +529,7 @@ class TestTimeline:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["interval"] == "weekly"
+        assert result["filters"]["interval"] == "weekly"
     
     async def test_timeline_monthly(
         self,
@@ -504,21 +561,34 @@ class TestTimeline:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["interval"] == "monthly"
+        assert result["filters"]["interval"] == "monthly"
     
     async def test_timeline_invalid_interval(
         self,
         async_client,
         auth_headers
     ):
-        """Test that invalid interval returns 400."""
+        """Test that invalid interval is rejected by validation."""
         response = await async_client.get(
             "/api/v1/aggregations/timeline?interval=yearly",
             headers=auth_headers
         )
         
+        assert response.status_code == 422
+    
+    async def test_timeline_invalid_date(
+        self,
+        async_client,
+        auth_headers
+    ):
+        """Test that an invalid date returns 400 with INVALID_DATE_FORMAT."""
+        response = await async_client.get(
+            "/api/v1/aggregations/timeline?start=not-a-date",
+            headers=auth_headers
+        )
+        
         assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_DATE_FORMAT"
     
     async def test_timeline_with_date_range(
         self,
@@ -554,9 +624,8 @@ class TestTimeline:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["start"] == start
-            assert item["filters"]["end"] == end
+        assert result["filters"]["start"] == start
+        assert result["filters"]["end"] == end
     
     async def test_timeline_with_source_filter(
         self,
@@ -588,8 +657,7 @@ class TestTimeline:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert item["filters"]["source"] == "bloomberg"
+        assert result["filters"]["source"] == "bloomberg"
 
 
 @pytest.mark.unit
@@ -675,10 +743,9 @@ class TestSourcePerformance:
         assert_valid_metadata(result["metadata"])
         
         # Check filters
-        for item in result["data"]:
-            assert "filters" in item
-            assert item["filters"]["start"] == start
-            assert item["filters"]["end"] == end
+        assert "filters" in result
+        assert result["filters"]["start"] == start
+        assert result["filters"]["end"] == end
     
     async def test_source_performance_avg_calculation(
         self,
@@ -716,6 +783,61 @@ class TestSourcePerformance:
             assert "avg_per_day" in result["data"][0] or "count" in result["data"][0]
 
 
+@pytest.mark.unit
+class TestDashboard:
+    """Test cases for GET /api/v1/aggregations/dashboard endpoint."""
+    
+    async def test_get_dashboard(
+        self,
+        async_client,
+        auth_headers,
+        mock_database_manager,
+        sample_aggregation_stats,
+        sample_timeline_data
+    ):
+        """Test that all dashboard aggregations come from one pipeline."""
+        mock_collection = mock_database_manager["collection"]
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "by_source": sample_aggregation_stats,
+            "timeline": sample_timeline_data,
+            "top_assets": [
+                {"asset": {"name": "Bitcoin", "slug": "bitcoin", "symbol": "BTC"}, "count": 50, "percentage": 25.0}
+            ],
+            "source_performance": [
+                {"source": "bloomberg", "total_news": 200}
+            ],
+            "total": [{"count": 200}]
+        }])
+        mock_collection.aggregate.return_value = mock_cursor
+        
+        response = await async_client.get(
+            "/api/v1/aggregations/dashboard?top_n=5",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        result = response.json()
+        assert result["success"] == True
+        assert_valid_metadata(result["metadata"])
+        assert result["total"] == 200
+        assert result["filters"]["top_n"] == 5
+        
+        data = result["data"]
+        assert data["by_source"] == sample_aggregation_stats
+        assert data["timeline"] == sample_timeline_data
+        assert data["top_assets"][0]["percentage"] == 25.0
+        assert data["source_performance"][0]["source"] == "bloomberg"
+        
+        # One round trip for all four aggregations
+        assert mock_collection.aggregate.call_count == 1
+    
+    async def test_dashboard_without_auth(self, async_client):
+        """Test that dashboard endpoint requires authentication."""
+        response = await async_client.get("/api/v1/aggregations/dashboard")
+        assert response.status_code == 401
+
+
 @pytest.mark.unit
 class TestAggregationAuthentication:
     """Test authentication for aggregation endpoints."""
@@ -739,3 +861,160 @@ class TestAggregationAuthentication:
         """Test that source-performance endpoint requires authentication."""
         response = await async_client.get("/api/v1/aggregations/source-performance")
         assert response.status_code == 401
+
+
+@pytest.mark.unit
+class TestAggregationCache:
+    """Test caching of aggregation results."""
+    
+    async def test_repeated_aggregation_uses_cache(self, mock_settings, monkeypatch):
+        """Test that identical aggregations within the TTL hit MongoDB once."""
+        monkeypatch.setattr(mock_settings, "AGGREGATION_CACHE_TTL", 60)
+        monkeypatch.setattr(aggregation_service, "_result_cache", {})
+        
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[{"source": "bloomberg", "count": 3}])
+        mock_collection = MagicMock()
+        mock_collection.aggregate.return_value = mock_cursor
+        service = aggregation_service.AggregationService({"test_news": mock_collection})
+        
+        first = await service.get_stats_by_source()
+        second = await service.get_stats_by_source()
+        
+        assert first == second == [{"source": "bloomberg", "count": 3}]
+        assert mock_collection.aggregate.call_count == 1
+    
+    async def test_closed_date_range_cached_longer(self, mock_settings, monkeypatch):
+        """Test that ranges ending in the past use the closed-range TTL."""
+        monkeypatch.setattr(mock_settings, "AGGREGATION_CACHE_TTL", 60)
+        monkeypatch.setattr(mock_settings, "AGGREGATION_CACHE_CLOSED_RANGE_TTL", 3600)
+        monkeypatch.setattr(aggregation_service, "_result_cache", {})
+        
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mock_collection = MagicMock()
+        mock_collection.aggregate.return_value = mock_cursor
+        service = aggregation_service.AggregationService({"test_news": mock_collection})
+        
+        now = datetime.now(timezone.utc)
+        await service.get_stats_by_source(now - timedelta(days=30), now - timedelta(days=7))
+        await service.get_stats_by_source(now - timedelta(days=7), now)
+        
+        closed, live = (entry[0] for entry in aggregation_service._result_cache.values())
+        assert closed - live > 3000
+    
+    async def test_concurrent_misses_run_pipeline_once(self, mock_settings, monkeypatch):
+        """Test that concurrent identical aggregations share one pipeline run."""
+        monkeypatch.setattr(mock_settings, "AGGREGATION_CACHE_TTL", 60)
+        monkeypatch.setattr(aggregation_service, "_result_cache", {})
+        
+        async def slow_to_list(length=None):
+            await asyncio.sleep(0.01)
+            return [{"source": "bloomberg", "count": 3}]
+        
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = slow_to_list
+        mock_collection = MagicMock()
+        mock_collection.aggregate.return_value = mock_cursor
+        service = aggregation_service.AggregationService({"test_news": mock_collection})
+        
+        results = await asyncio.gather(*(service.get_stats_by_source() for _ in range(5)))
+        
+        assert all(r == [{"source": "bloomberg", "count": 3}] for r in results)
+        assert mock_collection.aggregate.call_count == 1
+        
+        aggregation_service.clear_result_cache()
+        await service.get_stats_by_source()
+        assert mock_collection.aggregate.call_count == 2
+    
+    async def test_matching_etag_returns_not_modified(
+        self,
+        async_client,
+        auth_headers,
+        mock_database_manager,
+        mock_settings,
+        monkeypatch
+    ):
+        """Test that a repeated request with If-None-Match gets an empty 304."""
+        monkeypatch.setattr(mock_settings, "AGGREGATION_CACHE_TTL", 60)
+        monkeypatch.setattr(aggregation_service, "_result_cache", {})
+        
+        mock_collection = mock_database_manager["collection"]
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[{"buckets": [], "total": []}])
+        mock_collection.aggregate.return_value = mock_cursor
+        
+        first = await async_client.get("/api/v1/aggregations/stats", headers=auth_headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] in ("private, max-age=59", "private, max-age=60")
+        
+        second = await async_client.get(
+            "/api/v1/aggregations/stats",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        
+        other = await async_client.get(
+            "/api/v1/aggregations/stats?group_by=date",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert other.status_code == 200
+        
+        # Dates are validated before the conditional check
+        invalid = await async_client.get(
+            "/api/v1/aggregations/stats?start=not-a-date",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert invalid.status_code == 400
+        assert invalid.json()["error"]["code"] == "INVALID_DATE_FORMAT"
+    
+    async def test_etag_follows_cached_content(
+        self,
+        async_client,
+        auth_headers,
+        mock_database_manager,
+        mock_settings,
+        monkeypatch
+    ):
+        """Test that a recomputed result with new data gets a new ETag, and streams get none."""
+        monkeypatch.setattr(mock_settings, "AGGREGATION_CACHE_TTL", 60)
+        monkeypatch.setattr(aggregation_service, "_result_cache", {})
+        
+        mock_collection = mock_database_manager["collection"]
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[{"buckets": [], "total": []}])
+        mock_collection.aggregate.return_value = mock_cursor
+        
+        first = await async_client.get("/api/v1/aggregations/stats", headers=auth_headers)
+        etag = first.headers["etag"]
+        
+        # Entry expires and is recomputed with different data
+        aggregation_service.clear_result_cache()
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": [{"source": "bloomberg", "count": 1}],
+            "total": [{"count": 1}]
+        }])
+        second = await async_client.get(
+            "/api/v1/aggregations/stats",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert second.status_code == 200
+        assert second.headers["etag"] != etag
+        
+        class MockStreamCursor:
+            def __aiter__(self):
+                return self._iter()
+            
+            async def _iter(self):
+                yield {"date": "2025-11-20", "count": 1}
+        
+        mock_collection.aggregate.return_value = MockStreamCursor()
+        stream = await async_client.get(
+            "/api/v1/aggregations/timeline?format=ndjson",
+            headers=auth_headers
+        )
+        assert stream.status_code == 200
+        assert "etag" not in stream.headers
@@ -0,0 +1,56 @@
+"""
+Unit tests for ISO 8601 date parsing.
+Tests parse_iso with and without the optional ciso8601 parser.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.utils import dates
+from app.utils.dates import parse_iso
+from app.utils.exceptions import InvalidDateException
+
+
+def _ciso8601_parser():
+    ciso8601 = pytest.importorskip("ciso8601")
+    return ciso8601.parse_datetime
+
+
+@pytest.fixture(params=["fromisoformat", "ciso8601"])
+def parser_backend(request, monkeypatch):
+    """Run parse_iso through each parser backend."""
+    parser = None if request.param == "fromisoformat" else _ciso8601_parser()
+    monkeypatch.setattr(dates, "_parse_datetime", parser)
+    parse_iso.cache_clear()
+    yield request.param
+    parse_iso.cache_clear()
+
+
+@pytest.mark.unit
+class TestParseIso:
+    """Test cases for parse_iso."""
+
+    def test_z_suffix(self, parser_backend):
+        """Test that a trailing Z parses as UTC."""
+        assert parse_iso("2025-11-20T10:30:00Z") == datetime(2025, 11, 20, 10, 30, tzinfo=timezone.utc)
+
+    def test_offset(self, parser_backend):
+        """Test that an explicit UTC offset is kept."""
+        parsed = parse_iso("2025-11-20T10:30:00+03:30")
+
+        assert parsed.utcoffset() == timedelta(hours=3, minutes=30)
+        assert parsed == datetime(2025, 11, 20, 7, 0, tzinfo=timezone.utc)
+
+    def test_date_only(self, parser_backend):
+        """Test that a plain date parses as midnight."""
+        assert parse_iso("2025-11-20") == datetime(2025, 11, 20)
+
+    def test_empty_value(self, parser_backend):
+        """Test that missing values stay None."""
+        assert parse_iso(None) is None
+        assert parse_iso("") is None
+
+    def test_invalid_value(self, parser_backend):
+        """Test that invalid strings raise InvalidDateException."""
+        with pytest.raises(InvalidDateException):
+            parse_iso("not-a-date")
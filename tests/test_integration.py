@@ -3,6 +3,7 @@ Integration tests for complete workflows.
 Tests end-to-end scenarios combining multiple components.
 """
 
+import asyncio
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock
@@ -201,7 +202,10 @@ class TestAnalyticsWorkflow:
         mock_cursor = AsyncMock()
         
         # Step 1: Stats by source
-        mock_cursor.to_list = AsyncMock(return_value=sample_aggregation_stats)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": sample_aggregation_stats,
+            "total": [{"count": sum(item["count"] for item in sample_aggregation_stats)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         response1 = await async_client.get(
@@ -218,9 +222,8 @@ class TestAnalyticsWorkflow:
         assert "metadata" in result1
         assert_valid_metadata(result1["metadata"])
         
-        # Check that data items have filters and total
-        for item in result1["data"]:
-            assert "total" in item
+        # Check that the response has a total
+        assert "total" in result1
         
         # Step 2: Top assets
         mock_cursor.to_list = AsyncMock(return_value=sample_top_assets)
@@ -286,7 +289,10 @@ class TestAnalyticsWorkflow:
         """Test analytics with time range filtering."""
         mock_collection = mock_database_manager["collection"]
         mock_cursor = AsyncMock()
-        mock_cursor.to_list = AsyncMock(return_value=sample_timeline_data)
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "buckets": sample_timeline_data,
+            "total": [{"count": sum(item["count"] for item in sample_timeline_data)}]
+        }])
         mock_collection.aggregate.return_value = mock_cursor
         
         # Define date range
@@ -388,6 +394,43 @@ class TestErrorHandlingWorkflow:
             headers=auth_headers
         )
         assert response2.status_code == 422
+    
+    async def test_error_middleware_maps_exceptions(self):
+        """Test that ErrorHandlerMiddleware maps exceptions to error responses."""
+        from httpx import AsyncClient
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+        from app.middleware.error_handler import ErrorHandlerMiddleware
+        from app.utils.exceptions import NewsNotFoundException, InvalidCursorException
+        
+        errors = {
+            "not-found": NewsNotFoundException("missing"),
+            "cursor": InvalidCursorException("bad cursor"),
+            "value": ValueError("bad value"),
+            "boom": RuntimeError("internal detail"),
+        }
+        
+        async def raise_error(request):
+            raise errors[request.path_params["kind"]]
+        
+        app = Starlette(routes=[Route("/{kind}", raise_error)])
+        app.add_middleware(ErrorHandlerMiddleware)
+        
+        expected = {
+            "not-found": (404, "NEWS_NOT_FOUND"),
+            "cursor": (400, "INVALID_CURSOR"),
+            "value": (400, "INVALID_VALUE"),
+            "boom": (500, "INTERNAL_ERROR"),
+        }
+        
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            for kind, (status_code, code) in expected.items():
+                response = await client.get(f"/{kind}")
+                assert response.status_code == status_code
+                error = response.json()["error"]
+                assert error["code"] == code
+                assert error["request_id"]
+                assert "internal detail" not in response.text
 
 
 @pytest.mark.integration
@@ -715,3 +758,64 @@ class TestHealthCheckWorkflow:
         assert response.status_code == 200
         result = response.json()
         assert "status" in result
+    
+    async def test_health_check_ping_timeout(
+        self,
+        async_client,
+        mock_database_manager,
+        mock_settings,
+        monkeypatch
+    ):
+        """Test that a stalled database ping is reported as unhealthy."""
+        from app.core.database import db_manager
+        
+        async def stalled_ping():
+            await asyncio.sleep(1)
+            return True
+        
+        monkeypatch.setattr(db_manager, "ping", stalled_ping)
+        monkeypatch.setattr(mock_settings, "HEALTH_PING_TIMEOUT", 0.01)
+        
+        response = await async_client.get("/api/v1/health")
+        
+        assert response.status_code == 200
+        result = response.json()
+        assert result["status"] == "unhealthy"
+        assert result["database"]["error"] == "Database ping timed out"
+    
+    async def test_health_check_skips_middleware_stack(
+        self,
+        async_client,
+        mock_database_manager
+    ):
+        """Test that health probes bypass logging and rate limiting middleware."""
+        response = await async_client.get("/api/v1/health/live")
+        
+        assert response.status_code == 200
+        assert response.json()["alive"] == True
+        assert "X-Process-Time" not in response.headers
+        assert "X-RateLimit-Limit" not in response.headers
+    
+    async def test_unknown_health_path_returns_404(
+        self,
+        async_client,
+        mock_database_manager
+    ):
+        """Test that paths merely starting with /api/v1/health are not health probes."""
+        for path in ("/api/v1/health/nope", "/api/v1/healthz"):
+            response = await async_client.get(path)
+            
+            assert response.status_code == 404
+    
+    async def test_health_check_keeps_cors_headers(
+        self,
+        async_client,
+        mock_database_manager
+    ):
+        """Test that health responses still go through the CORS middleware."""
+        response = await async_client.get(
+            "/api/v1/health",
+            headers={"Origin": "http://example.com"}
+        )
+        
+        assert "access-control-allow-origin" in response.headers
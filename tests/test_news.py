@@ -7,7 +7,9 @@ import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, patch
 
+from app.models.request import NewsQueryParams
 from app.models.response import NewsListResponse
+from app.services.news_service import NewsService
 
 
 def assert_valid_metadata(metadata):
@@ -160,6 +162,14 @@ class TestGetNewsList:
         
         mock_collection.find.assert_called_once()
     
+    def test_keyword_search_uses_text_index(self):
+        """Test that keyword search builds a $text query, not a regex scan."""
+        service = NewsService(None)
+        
+        query = service._build_query(NewsQueryParams(keyword="bitcoin", source="bloomberg"))
+        
+        assert query == {"source": "bloomberg", "$text": {"$search": "bitcoin"}}
+    
     async def test_get_news_with_date_range(
         self,
         async_client,
@@ -212,6 +222,19 @@ class TestGetNewsList:
         assert "detail" in result
         assert result["detail"]["error"]["code"] == "INVALID_DATE_FORMAT"
     
+    async def test_get_news_with_invalid_sort_field(
+        self,
+        async_client,
+        auth_headers
+    ):
+        """Test that an unknown sort field is rejected by validation."""
+        response = await async_client.get(
+            "/api/v1/news?sort_by=content",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 422
+    
     async def test_get_news_with_pagination_cursor(
         self,
         async_client,
@@ -26,13 +26,12 @@ class TestCursorEncoding:
         
         encoded = PaginationCursor.encode(cursor_data)
         
-        # Should be base64 string
+        # Should be a compact URL-safe base64 string
         assert isinstance(encoded, str)
-        assert len(encoded) > 0
+        assert len(encoded) == 28
         
         # Should be decodable
-        decoded_str = base64.b64decode(encoded.encode()).decode()
-        decoded_data = json.loads(decoded_str)
+        decoded_data = PaginationCursor.decode(encoded)
         assert "_id" in decoded_data
         assert "releasedAt" in decoded_data
     
@@ -45,12 +44,11 @@ class TestCursorEncoding:
         }
         
         encoded = PaginationCursor.encode(cursor_data)
-        decoded_str = base64.b64decode(encoded.encode()).decode()
-        decoded_data = json.loads(decoded_str)
+        decoded_data = PaginationCursor.decode(encoded)
         
-        # Check that datetime was converted to ISO format
-        assert "T" in decoded_data["releasedAt"]
-        assert decoded_data["releasedAt"].endswith("Z") or "+00:00" in decoded_data["releasedAt"]
+        # Check that datetime survives the round trip as UTC
+        assert decoded_data["releasedAt"] == aware_dt
+        assert decoded_data["releasedAt"].tzinfo is not None
     
     def test_encode_cursor_with_naive_datetime(self):
         """Test encoding naive datetime (without timezone)."""
@@ -75,8 +73,7 @@ class TestCursorEncoding:
         }
         
         encoded = PaginationCursor.encode(cursor_data)
-        decoded_str = base64.b64decode(encoded.encode()).decode()
-        decoded_data = json.loads(decoded_str)
+        decoded_data = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
         
         assert len(decoded_data) == 3
         assert all(key in decoded_data for key in ["_id", "releasedAt", "title"])
@@ -95,6 +92,20 @@ class TestCursorEncoding:
         assert encoded1 == encoded2
 
 
+    def test_encode_id_time_matches_generic_encode(self):
+        """Test that the specialized encoder agrees with encode()."""
+        released_at = datetime(2025, 11, 20, 12, 0, 0, tzinfo=timezone.utc)
+        
+        for doc_id, field, value in [
+            ("507f1f77bcf86cd799439011", "releasedAt", released_at),
+            ("id1", "releasedAt", released_at),
+            ("507f1f77bcf86cd799439011", "title", "Test Article"),
+        ]:
+            assert PaginationCursor.encode_id_time(doc_id, value, field) == (
+                PaginationCursor.encode({"_id": doc_id, field: value})
+            )
+
+
 @pytest.mark.unit
 class TestCursorDecoding:
     """Test cursor decoding functionality."""
@@ -146,10 +157,23 @@ class TestCursorDecoding:
         decoded = PaginationCursor.decode(encoded)
         
         # _id should match
-        assert decoded["_id"] == original["_id"]
-        # releasedAt should be ISO string after encoding
-        assert "releasedAt" in decoded
-        assert isinstance(decoded["releasedAt"], str)
+        assert str(decoded["_id"]) == original["_id"]
+        # releasedAt should be restored as a datetime
+        assert decoded["releasedAt"] == original["releasedAt"]
+    
+    def test_encode_decode_roundtrip_non_objectid(self):
+        """Test that non-ObjectId cursors fall back to the JSON format."""
+        original = {
+            "_id": "id1",
+            "releasedAt": datetime(2025, 11, 20, 12, 0, 0, tzinfo=timezone.utc)
+        }
+        
+        encoded = PaginationCursor.encode(original)
+        decoded = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+        
+        assert decoded["_id"] == "id1"
+        assert decoded["releasedAt"] == "2025-11-20T12:00:00Z"
+        assert PaginationCursor.decode(encoded) == decoded
 
 
 @pytest.mark.unit
@@ -190,6 +214,27 @@ class TestCursorQuery:
         assert "$or" in query
         assert len(query["$or"]) == 2
     
+    def test_build_query_operators(self):
+        """Test that sort order selects $lt/$gt for both $or branches."""
+        cursor_data = {
+            "_id": "507f1f77bcf86cd799439011",
+            "title": "Test Article"
+        }
+        
+        for order, op in [("desc", "$lt"), ("asc", "$gt")]:
+            query = PaginationCursor.build_cursor_query(
+                cursor_data,
+                sort_field="title",
+                sort_order=order
+            )
+            
+            assert query == {
+                "$or": [
+                    {"title": {op: "Test Article"}},
+                    {"title": "Test Article", "_id": {op: "507f1f77bcf86cd799439011"}},
+                ]
+            }
+    
     def test_build_query_empty_cursor(self):
         """Test building query with empty cursor data."""
         query = PaginationCursor.build_cursor_query(
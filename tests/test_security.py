@@ -3,12 +3,13 @@ Unit tests for security features.
 Tests API key authentication and rate limiting.
 """
 
+import asyncio
 import pytest
 import time
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from app.core.security import verify_api_key
-from app.middleware.rate_limit import RateLimiter
+from app.core.security import verify_api_key, extract_api_key
+from app.middleware.rate_limit import RateLimiter, RateLimitMiddleware, RedisRateLimiter, _TimestampRing
 
 
 def assert_valid_metadata(metadata):
@@ -228,6 +229,48 @@ class TestAPIKeyAuthentication:
         )
         
         assert response.status_code == 401
+    
+    async def test_bearer_prefix_only_stripped_at_start(self, mock_settings):
+        """Test that "Bearer " is only removed as a leading prefix."""
+        mock_settings.API_KEYS = "abcBearer xyz"
+        
+        # Prefix stripped, embedded occurrence preserved
+        assert await verify_api_key("Bearer abcBearer xyz", None) == "abcBearer xyz"
+        assert await verify_api_key("abcBearer xyz", None) == "abcBearer xyz"
+    
+    async def test_auth_disabled_without_api_keys(self, mock_settings):
+        """Test that an empty API_KEYS setting disables authentication."""
+        mock_settings.API_KEYS = ""
+        
+        assert mock_settings.auth_disabled is True
+        assert await verify_api_key(None, None) == "development-mode"
+    
+    def test_extract_api_key_from_scope(self):
+        """Test raw API key extraction used by middleware."""
+        def scope(headers=(), query_string=b""):
+            return {"headers": list(headers), "query_string": query_string}
+        
+        bearer = [(b"authorization", b"Bearer header-key")]
+        assert extract_api_key(scope(bearer, b"api_key=query-key")) == b"header-key"
+        assert extract_api_key(scope(query_string=b"limit=10&api_key=query-key&x=1")) == b"query-key"
+        assert extract_api_key(scope(query_string=b"api_key=query-key")) == b"query-key"
+        assert extract_api_key(scope(query_string=b"x_api_key=nope")) is None
+        assert extract_api_key(scope([(b"authorization", b"Basic abc")])) is None
+        assert extract_api_key(scope()) is None
+        
+        # URL-decoded, and the last occurrence wins like in verify_api_key
+        assert extract_api_key(scope(query_string=b"api_key=%71uery-key")) == b"query-key"
+        assert extract_api_key(scope(query_string=b"api_key=a+b%2Bc")) == b"a b+c"
+        assert extract_api_key(scope(query_string=b"api_key=first&api_key=last")) == b"last"
+    
+    def test_api_keys_set_tracks_reassignment(self, mock_settings):
+        """Test that the parsed key set follows API_KEYS when it changes."""
+        mock_settings.API_KEYS = " key-one , key-two,, "
+        assert mock_settings.api_keys_set == frozenset({"key-one", "key-two"})
+        
+        mock_settings.API_KEYS = "key-three"
+        assert mock_settings.api_keys_set == frozenset({"key-three"})
+        assert mock_settings.get_api_keys() == ["key-three"]
 
 
 @pytest.mark.unit
@@ -277,6 +320,19 @@ class TestRateLimiting:
         assert retry_after <= 60
         assert retry_after >= 1
     
+    def test_encoded_query_key_shares_bucket(self):
+        """Test that percent-encoded spellings of a key share one rate limit bucket."""
+        middleware = RateLimitMiddleware(app=None)
+        
+        def identifier(query_string):
+            scope = {"headers": [], "query_string": query_string, "client": ("1.2.3.4", 0)}
+            return middleware._get_identifier(scope)
+        
+        plain = identifier(b"api_key=ABC-key")
+        assert identifier(b"api_key=%41BC-key") == plain
+        assert identifier(b"api_key=%41%42%43%2Dkey") == plain
+        assert identifier(b"limit=10&api_key=%41BC-key") == plain
+    
     def test_rate_limiter_window_expiration(self):
         """Test that old requests are removed after window expires."""
         limiter = RateLimiter(max_requests=2, window_seconds=1)  # 1 second window
@@ -333,6 +389,117 @@ class TestRateLimiting:
         assert usage["used"] == 3
         assert usage["remaining"] == 7
     
+    def test_timestamp_ring_wraps_in_place(self):
+        """Test that the timestamp ring evicts and wraps without outgrowing capacity."""
+        ring = _TimestampRing(capacity=3)
+        
+        for ts in (1.0, 2.0, 3.0):
+            ring.append(ts)
+        ring.evict_until(1.5)
+        ring.append(4.0)  # Wraps into the slot freed by 1.0
+        
+        assert len(ring) == 3
+        assert ring.oldest() == 2.0
+        assert len(ring.buf) == 3
+        
+        ring.evict_until(10.0)
+        assert len(ring) == 0
+    
+    def test_rate_limiter_sweep_drops_idle_identifiers(self):
+        """Test that the incremental sweep forgets identifiers with expired requests."""
+        limiter = RateLimiter(max_requests=5, window_seconds=16)
+        limiter.is_allowed("ip:1.2.3.4")
+        shard = limiter._shard("ip:1.2.3.4")
+        assert "ip:1.2.3.4" in shard
+        
+        # Once the window has passed, sweeping every shard empties the store
+        later = time.monotonic() + 17
+        for i in range(16):
+            limiter._maybe_sweep(later + i)
+        
+        assert "ip:1.2.3.4" not in shard
+    
+    def _redis_limiter(self, script, cooldown_seconds=5.0):
+        """Build a RedisRateLimiter whose Lua script is the given stub."""
+        client = MagicMock()
+        client.register_script.return_value = script
+        return RedisRateLimiter(
+            client,
+            max_requests=10,
+            window_seconds=60,
+            timeout_seconds=0.05,
+            cooldown_seconds=cooldown_seconds
+        )
+    
+    async def test_redis_limiter_allows(self):
+        """Test that an allowed script result is returned with usage stats."""
+        limiter = self._redis_limiter(AsyncMock(return_value=[1, 0, 3]))
+        
+        with patch("app.middleware.rate_limit.time.time", return_value=1000.0):
+            is_allowed, retry_after, usage = await limiter.check("ip:1.2.3.4")
+        
+        assert is_allowed is True
+        assert retry_after is None
+        assert usage == {"used": 3, "limit": 10, "remaining": 7, "reset_at": 1060}
+        assert limiter._script.call_args.kwargs["keys"] == ["rate_limit:ip:1.2.3.4"]
+    
+    async def test_redis_limiter_denies_with_rounded_retry_after(self):
+        """Test that a denied request waits until the oldest entry leaves the window."""
+        # Oldest entry expires 12.3 s from now, so clients retry after 13 s
+        limiter = self._redis_limiter(AsyncMock(return_value=[0, 952_300, 10]))
+        
+        with patch("app.middleware.rate_limit.time.time", return_value=1000.0):
+            assert await limiter.check("ip:1.2.3.4") == (False, 13, None)
+        
+        # An entry that is already due still asks for at least one second
+        limiter._script.return_value = [0, 900_000, 10]
+        with patch("app.middleware.rate_limit.time.time", return_value=1000.0):
+            assert await limiter.check("ip:1.2.3.4") == (False, 1, None)
+    
+    async def test_redis_limiter_cooldown_after_failure(self):
+        """Test that a failed call skips Redis and logs once until the cooldown ends."""
+        limiter = self._redis_limiter(AsyncMock(side_effect=ConnectionError("down")))
+        
+        with patch("app.middleware.rate_limit.log_warning") as mock_log, \
+                patch("app.middleware.rate_limit._now", return_value=100.0):
+            assert await limiter.check("ip:1.2.3.4") is None
+            assert await limiter.check("ip:1.2.3.4") is None
+        
+        assert limiter._script.await_count == 1
+        assert mock_log.call_count == 1
+        
+        # After the cooldown Redis is tried again
+        limiter._script.side_effect = None
+        limiter._script.return_value = [1, 0, 1]
+        with patch("app.middleware.rate_limit._now", return_value=105.0):
+            is_allowed, _, _ = await limiter.check("ip:1.2.3.4")
+        
+        assert is_allowed is True
+        assert limiter._script.await_count == 2
+    
+    async def test_redis_limiter_timeout(self):
+        """Test that a slow Redis call gives up after the timeout."""
+        async def slow_script(**kwargs):
+            await asyncio.sleep(1)
+        
+        limiter = self._redis_limiter(slow_script)
+        
+        with patch("app.middleware.rate_limit.log_warning"):
+            assert await limiter.check("ip:1.2.3.4") is None
+    
+    async def test_middleware_falls_back_to_local_limiter(self):
+        """Test that the middleware uses the local limiter when Redis is unavailable."""
+        middleware = RateLimitMiddleware(app=None)
+        middleware.redis_limiter = self._redis_limiter(AsyncMock(side_effect=TimeoutError()))
+        
+        with patch("app.middleware.rate_limit.log_warning"):
+            is_allowed, retry_after, usage = await middleware._check("ip:1.2.3.4")
+        
+        assert is_allowed is True
+        assert retry_after is None
+        assert usage == middleware.limiter.get_usage("ip:1.2.3.4")
+        assert usage["used"] == 1
+    
     async def test_rate_limit_headers_present(
         self,
         async_client,